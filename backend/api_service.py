@@ -1,9 +1,16 @@
+import asyncio
+import logging
 import httpx
 from datetime import datetime, timezone, timedelta
 from typing import List, Optional
 from models import PlayerEvent
 from config import settings
-from players import PLAYER_ID_MAP
+from roster import API_FOOTBALL, roster_registry
+from rate_limiter import RateLimiter
+from fixture_planner import FixturePlanner, TeamIndex
+from timestamps import format_timestamp, incident_time, to_epoch
+
+logger = logging.getLogger(__name__)
 
 
 class FootballAPIService:
@@ -13,63 +20,90 @@ class FootballAPIService:
             "X-RapidAPI-Key": settings.rapidapi_key,
             "X-RapidAPI-Host": settings.rapidapi_host
         }
+        # One pooled client for the app's lifetime (see start/close)
+        self._client: Optional[httpx.AsyncClient] = None
+        # Quota-aware limiter: per-minute budget, deferred when RapidAPI reports it is used up
+        self.rate_limiter = RateLimiter(
+            settings.rapidapi_requests_per_minute / 60,
+            burst=settings.rapidapi_max_concurrency
+        )
+        self._semaphore = asyncio.Semaphore(settings.rapidapi_max_concurrency)
+        # Fetch events only for fixtures involving a tracked club (rebuilt when the roster reloads)
+        roster = roster_registry.current
+        self.planner = FixturePlanner(TeamIndex(roster.players))
+        self._roster_version = roster.version
+
+    async def start(self) -> None:
+        """Open the shared connection pool (called from the app lifespan)"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={k: v for k, v in self.headers.items() if v is not None},
+                limits=httpx.Limits(
+                    max_connections=settings.rapidapi_max_concurrency,
+                    max_keepalive_connections=settings.rapidapi_max_concurrency
+                ),
+                timeout=10.0
+            )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get(self, path: str, params: dict) -> List[dict]:
+        """GET an API-Football endpoint through the shared client, limiter and concurrency cap"""
+        if self._client is None:
+            await self.start()
+        
+        async with self._semaphore:
+            await self.rate_limiter.acquire()
+            response = await self._client.get(path, params=params)
+        
+        # Per-minute quota exhausted: hold every caller until the window resets
+        if response.headers.get("X-RateLimit-Remaining") == "0" or response.status_code == 429:
+            self.rate_limiter.defer(60)
+        
+        response.raise_for_status()
+        data = response.json()
+        return data.get("response", [])
 
     async def get_live_fixtures(self) -> List[dict]:
         """Fetch all live fixtures"""
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/v3/fixtures",
-                    headers=self.headers,
-                    params={"live": "all"},
-                    timeout=10.0
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data.get("response", [])
-            except Exception as e:
-                print(f"Error fetching live fixtures: {e}")
-                return []
+        try:
+            return await self._get("/v3/fixtures", {"live": "all"})
+        except Exception as e:
+            logger.warning("Error fetching live fixtures: %s", e)
+            return []
 
     async def get_fixture_events(self, fixture_id: int) -> List[dict]:
         """Fetch events for a specific fixture"""
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/v3/fixtures/events",
-                    headers=self.headers,
-                    params={"fixture": fixture_id},
-                    timeout=10.0
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data.get("response", [])
-            except Exception as e:
-                print(f"Error fetching fixture events: {e}")
-                return []
+        try:
+            return await self._get("/v3/fixtures/events", {"fixture": fixture_id})
+        except Exception as e:
+            logger.warning("Error fetching fixture events: %s", e)
+            return []
 
     async def get_recent_fixtures(self, hours: int = 24) -> List[dict]:
         """Fetch fixtures from the last X hours"""
         from_date = (datetime.now(timezone.utc) - timedelta(hours=hours)).strftime("%Y-%m-%d")
         to_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/v3/fixtures",
-                    headers=self.headers,
-                    params={
-                        "from": from_date,
-                        "to": to_date
-                    },
-                    timeout=10.0
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data.get("response", [])
-            except Exception as e:
-                print(f"Error fetching recent fixtures: {e}")
-                return []
+        try:
+            return await self._get("/v3/fixtures", {"from": from_date, "to": to_date})
+        except Exception as e:
+            logger.warning("Error fetching recent fixtures: %s", e)
+            return []
+
+    async def _get_planned_fixture_events(self, fixture: dict) -> List[dict]:
+        """Events for a tracked fixture; finished fixtures are served from the planner's cache"""
+        cached = self.planner.cached_events(fixture["fixture"]["id"])
+        if cached is not None:
+            return cached
+        
+        events = await self.get_fixture_events(fixture["fixture"]["id"])
+        self.planner.record_events(fixture, events)
+        return events
 
     def parse_event_type(self, event_type: str, detail: str) -> tuple[str, str]:
         """Parse API event type to our simplified type"""
@@ -91,47 +125,35 @@ class FootballAPIService:
         else:
             return "other", event_type
 
-    def calculate_timestamp(self, fixture_date: str, event_minute: int) -> str:
-        """Calculate relative timestamp from fixture date and event minute"""
-        try:
-            # Parse fixture date
-            fixture_datetime = datetime.fromisoformat(fixture_date.replace('Z', '+00:00'))
-            # Add event minute
-            event_datetime = fixture_datetime + timedelta(minutes=event_minute)
-            # Calculate difference from now
-            now = datetime.now(timezone.utc)
-            diff = now - event_datetime
-            
-            if diff.total_seconds() < 60:
-                return "just now"
-            elif diff.total_seconds() < 3600:
-                minutes = int(diff.total_seconds() / 60)
-                return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
-            elif diff.total_seconds() < 86400:
-                hours = int(diff.total_seconds() / 3600)
-                return f"{hours} hour{'s' if hours != 1 else ''} ago"
-            else:
-                days = int(diff.total_seconds() / 86400)
-                return f"{days} day{'s' if days != 1 else ''} ago"
-        except Exception as e:
-            print(f"Error calculating timestamp: {e}")
-            return "recently"
-
     async def get_canadian_player_events(self) -> List[PlayerEvent]:
         """Get recent events for Canadian national team players"""
         events = []
-        event_id = 1
+        roster = roster_registry.current
+        if roster.version != self._roster_version:
+            self.planner.team_index = TeamIndex(roster.players)
+            self._roster_version = roster.version
         
-        # Get live fixtures
-        live_fixtures = await self.get_live_fixtures()
+        # Get live fixtures and fixtures from the last 24 hours together
+        live_fixtures, recent_fixtures = await asyncio.gather(
+            self.get_live_fixtures(),
+            self.get_recent_fixtures(hours=24)
+        )
         
-        # Also get recent fixtures from last 24 hours
-        recent_fixtures = await self.get_recent_fixtures(hours=24)
+        # Combine and deduplicate fixtures, keeping only matches a tracked player's club plays in
+        all_fixtures = self.planner.select(live_fixtures + recent_fixtures)
         
-        # Combine and deduplicate fixtures
-        all_fixtures = {f["fixture"]["id"]: f for f in live_fixtures + recent_fixtures}
+        # Fetch events for the remaining fixtures concurrently (bounded by the quota limiter)
+        fixture_events_list = await asyncio.gather(*(
+            self._get_planned_fixture_events(fixture) for fixture in all_fixtures.values()
+        ))
         
-        for fixture in all_fixtures.values():
+        report = self.planner.last_report
+        logger.info(
+            "API-Football: %d/%d fixtures tracked, %d calls (%d saved, %d from cache)",
+            report.fixtures_tracked, report.fixtures_seen, report.calls_made, report.calls_saved, report.events_cached
+        )
+        
+        for fixture, fixture_events in zip(all_fixtures.values(), fixture_events_list):
             fixture_id = fixture["fixture"]["id"]
             fixture_date = fixture["fixture"]["date"]
             home_team = fixture["teams"]["home"]["name"]
@@ -140,15 +162,13 @@ class FootballAPIService:
             away_goals = fixture["goals"]["away"] or 0
             league_name = fixture["league"]["name"]
             
-            # Get events for this fixture
-            fixture_events = await self.get_fixture_events(fixture_id)
-            
             for event in fixture_events:
                 player_id = event.get("player", {}).get("id")
                 
                 # Check if this is one of our tracked Canadian players
-                if player_id in PLAYER_ID_MAP:
-                    player_name = PLAYER_ID_MAP[player_id]
+                player = roster.by_id(API_FOOTBALL, player_id)
+                if player is not None:
+                    player_name = player.name
                     event_type_raw = event.get("type", "")
                     event_detail = event.get("detail", "")
                     event_minute = event.get("time", {}).get("elapsed", 0)
@@ -163,24 +183,27 @@ class FootballAPIService:
                     # Create context string
                     context = f"{home_team} {home_goals}-{away_goals} {away_team}"
                     
-                    # Calculate timestamp
-                    timestamp = self.calculate_timestamp(fixture_date, event_minute)
+                    event_extra = event.get("time", {}).get("extra") or 0
+                    kickoff_at = to_epoch(fixture_date)
+                    occurred_at = incident_time(kickoff_at, event_minute, event_extra)
                     
                     events.append(PlayerEvent(
-                        id=event_id,
+                        # API-Football events carry no ID; fixture + clock + player is stable across polls
+                        id=f"af-{fixture_id}-{event_minute}+{event_extra}-{player_id}-{event_type}",
                         player=player_name,
                         event=event_name,
                         type=event_type,
                         context=context,
                         minute=f"{event_minute}'",
-                        timestamp=timestamp,
+                        timestamp=format_timestamp(occurred_at),
                         league=league_name,
-                        team=event.get("team", {}).get("name")
+                        team=event.get("team", {}).get("name"),
+                        kickoff_at=kickoff_at,
+                        occurred_at=occurred_at
                     ))
-                    event_id += 1
         
-        # Sort by most recent first (you might want to implement better sorting)
-        return sorted(events, key=lambda x: x.timestamp)[:10]  # Return top 10 recent events
+        # Most recent first
+        return sorted(events, key=lambda x: x.occurred_at or 0, reverse=True)[:10]  # Return top 10 recent events
 
 
 football_api = FootballAPIService()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Live-pulse cycle cost as the tracked pool grows, per-player scanning vs club batching.
+
+A synthetic world: players spread over clubs (about 0.55 clubs per player, like a national
+pool concentrated in a few leagues), clubs paired into matches, every tracked player scoring
+in their club's match. Phases:
+    cold      the first scan (club lookups, every list, every match's incidents)
+    idle      the next poll with no match on (the schedule keeps every list in the store)
+    live      a poll once one match (clubs 1 and 2) has kicked off
+    schedule  a poll once the stored lists have expired (every SCHEDULE_TTL seconds)
+
+Run from the backend directory:
+    python -m benchmarks.pool_scale --players 10 40 80 --latency 0.05
+"""
+import argparse
+import asyncio
+import math
+import re
+import time
+
+from benchmarks.season_stats import stub_roster
+from config import settings
+from response_store import ResponseStore
+from sofascore_scraper import SofaScoreScraper
+from transport import FakeTransport, TransportResponse
+
+EVENT_LIST = re.compile(r"/(player|team)/(\d+)/events/(last|next)/\d+$")
+PLAYER = re.compile(r"/player/(\d+)$")
+INCIDENTS = re.compile(r"/event/(\d+)/incidents$")
+PHASES = ("cold", "idle", "live", "schedule")
+
+
+# Clubs 1 and 2 meet again this many seconds after the world is created
+REMATCH_DELAY = 5.0
+
+
+def world_handler(players: int):
+    clubs = max(1, math.ceil(players * 0.55))
+    club_of = {player_id: (player_id - 1) % clubs + 1 for player_id in range(1, players + 1)}
+    # Clubs 1 and 2 play match 1001, clubs 3 and 4 play match 1002, ...
+    match_of = {club: 1000 + (club + 1) // 2 for club in range(1, clubs + 1)}
+    kickoff = int(time.time()) - 3 * 3600
+    rematch_kickoff = time.time() + REMATCH_DELAY
+
+    def event(match_id: int, home: int, status: str, start: float) -> dict:
+        return {
+            "id": match_id,
+            "status": {"type": status},
+            "startTimestamp": int(start),
+            "tournament": {"name": "Stub League", "uniqueTournament": {"id": 1}},
+            "season": {"id": 1},
+            "homeTeam": {"name": f"Club {home}"},
+            "awayTeam": {"name": f"Club {home + 1}"},
+            "homeScore": {"current": 2},
+            "awayScore": {"current": 1},
+        }
+
+    def event_lists(club: int) -> tuple:
+        match_id = match_of[club]
+        recent = [event(match_id, 2 * (match_id - 1000) - 1, "finished", kickoff)]
+        upcoming = []
+        if club in (1, 2):
+            rematch = event(2001, 1, "notstarted", rematch_kickoff)
+            if time.time() >= rematch_kickoff:
+                recent.append({**rematch, "status": {"type": "inprogress"}})
+            else:
+                upcoming.append(rematch)
+        return recent, upcoming
+
+    def handler(url: str) -> TransportResponse:
+        path = url.split("/api/v1", 1)[-1]
+        match = EVENT_LIST.search(path)
+        if match:
+            kind, entity_id, which = match.group(1), int(match.group(2)), match.group(3)
+            club = club_of[entity_id] if kind == "player" else entity_id
+            recent, upcoming = event_lists(club)
+            events = recent if which == "last" else upcoming
+            # SofaScore answers 404 for an empty list
+            return TransportResponse(200, {"events": events}) if events else TransportResponse(404, {})
+        match = PLAYER.search(path)
+        if match:
+            return TransportResponse(200, {"player": {"team": {"id": club_of[int(match.group(1))]}}})
+        match = INCIDENTS.search(path)
+        if match:
+            match_id = int(match.group(1))
+            in_match = (lambda club: club in (1, 2)) if match_id == 2001 else (lambda club: match_of[club] == match_id)
+            return TransportResponse(200, {"incidents": [
+                {"id": match_id * 1000 + player_id, "incidentType": "goal", "time": 10 + player_id % 80,
+                 "isHome": club_of[player_id] % 2 == 1, "player": {"id": player_id}}
+                for player_id in club_of if in_match(club_of[player_id])
+            ]})
+        return TransportResponse(404, {})
+
+    return handler, clubs, len(set(match_of.values()))
+
+
+async def cycle(players: int, batch_by_club: bool, latency: float, concurrency: int) -> dict:
+    settings.sofascore_batch_by_club = batch_by_club
+    # Polls here are milliseconds apart; treat every live read as past LIVE_RESPONSE_TTL
+    settings.live_response_ttl = 0
+    handler, clubs, matches = world_handler(players)
+    transport = FakeTransport(handler, latency=latency)
+    scraper = SofaScoreScraper(
+        max_concurrency=concurrency,
+        requests_per_second=0,
+        response_store=ResponseStore(":memory:"),
+        transport=transport,
+        roster=stub_roster(players)
+    )
+    created = time.time()
+
+    async def timed() -> tuple:
+        before = transport.calls
+        start = time.perf_counter()
+        events = await scraper.get_canadian_player_events(limit=1000)
+        return time.perf_counter() - start, transport.calls - before, events
+
+    phases = {"clubs": clubs, "matches": matches}
+    phases["cold"] = await timed()
+    assert len(phases["cold"][2]) == players, (len(phases["cold"][2]), players)
+    phases["idle"] = await timed()
+
+    # Clubs 1 and 2 kick off: only their lists and the live match are read
+    await asyncio.sleep(max(0.0, created + REMATCH_DELAY - time.time()))
+    phases["live"] = await timed()
+
+    # Expire every stored list, as a poll after SCHEDULE_TTL would see them
+    for path, stored in scraper.response_store.items().items():
+        if EVENT_LIST.search(path):
+            scraper.response_store.put(path, stored.body, fetched_at=1.0)
+    phases["schedule"] = await timed()
+    return phases
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, nargs="+", default=[10, 40, 80])
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per stubbed request")
+    parser.add_argument("--concurrency", type=int, default=6)
+    args = parser.parse_args()
+
+    print(f"latency={args.latency}s concurrency={args.concurrency}  (upstream calls / seconds per phase)")
+    print(f"{'players':>8} {'clubs':>6} {'matches':>8} {'mode':>10} "
+          + " ".join(f"{phase:>15}" for phase in PHASES))
+    for n in args.players:
+        for batch_by_club, mode in ((False, "per-player"), (True, "by-club")):
+            phases = await cycle(n, batch_by_club, args.latency, args.concurrency)
+            cells = " ".join(f"{phases[p][1]:>6} / {phases[p][0]:>5.2f}s" for p in PHASES)
+            print(f"{n:>8} {phases['clubs']:>6} {phases['matches']:>8} {mode:>10} {cells}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
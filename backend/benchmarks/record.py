@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Record live SofaScore responses for the tracked players into benchmarks/fixtures/recorded.json,
+which the replay session prefers over the templates.
+
+Run from the backend directory (hits the live site once per endpoint):
+    python -m benchmarks.record
+"""
+import asyncio
+import json
+
+from benchmarks.replay import FIXTURES_DIR
+from response_store import ResponseStore
+from sofascore_scraper import SofaScoreScraper
+
+
+async def main():
+    # A private in-memory store captures every body the scraper fetches, keyed by URL path
+    store = ResponseStore(":memory:")
+    scraper = SofaScoreScraper(response_store=store)
+    try:
+        await scraper.get_canadian_player_events()
+        await scraper.get_player_season_stats()
+    finally:
+        await scraper.transport.close()
+
+    recorded = {path: stored.body for path, stored in store.items().items()}
+    output = FIXTURES_DIR / "recorded.json"
+    output.write_text(json.dumps(recorded, indent=1, ensure_ascii=False))
+    print(f"Recorded {len(recorded)} responses to {output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
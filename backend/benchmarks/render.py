@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of response rendering for /api/live-pulse and /api/season-stats: building and
+serializing the body on every request (validated model -> jsonable_encoder -> JSONResponse, as
+FastAPI does for a returned model) against serving the pre-rendered bytes from a RenderCache.
+Reports responses per second per payload, and body sizes per encoding.
+
+Run from the backend directory:
+    python -m benchmarks.render --events 8 50 --players 11 80
+"""
+import os
+
+# Never touch the on-disk stores; set before config is imported
+os.environ.setdefault("RESPONSE_STORE_PATH", ":memory:")
+
+import argparse
+import time
+from typing import Any, Callable
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from models import LivePulseResponse, PlayerEvent
+from rendered import RenderCache, brotli, orjson
+
+ACCEPT = "gzip, deflate, br"
+
+
+def live_pulse(events: int) -> LivePulseResponse:
+    return LivePulseResponse(
+        events=[
+            PlayerEvent(
+                id=f"{12437856 + i}-{118205373 + i}-935564-goal", player="Jonathan David", event="Goal",
+                type="goal", context="Juventus 2-1 Inter", minute=f"{i % 90}'", timestamp="2025-12-26T04:22:00Z",
+                league="Serie A", team="Juventus", kickoff_at=1766718000, occurred_at=1766722920 + i
+            )
+            for i in range(events)
+        ],
+        last_updated="2025-12-26T05:14:29.507010+00:00",
+        cursor=12,
+        next_before=None
+    )
+
+
+def season_stats(players: int) -> dict:
+    return {
+        "season": "2025/26",
+        "players": {
+            f"Player {i}": {"matches": 21, "minutes": 1740, "goals": i % 9, "assists": i % 5, "rating": 7.12}
+            for i in range(players)
+        },
+        "count": players,
+        "last_updated": "2025-12-26T05:14:29.507010+00:00"
+    }
+
+
+def rate(fn: Callable[[], Any], seconds: float) -> float:
+    """Calls per second of fn over about `seconds`"""
+    calls, start = 0, time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < seconds:
+        for _ in range(100):
+            fn()
+        calls += 100
+    return calls / elapsed
+
+
+def per_request(payload: Any) -> Callable[[], Response]:
+    if isinstance(payload, LivePulseResponse):
+        data = payload.model_dump()
+        return lambda: JSONResponse(jsonable_encoder(LivePulseResponse.model_validate(data)))
+    return lambda: JSONResponse(jsonable_encoder(payload))
+
+
+def pre_rendered(payload: Any) -> Callable[[], Response]:
+    cache = RenderCache()
+
+    def respond() -> Response:
+        body, encoding = cache.get("etag", lambda: payload).negotiate(ACCEPT)
+        return Response(body, media_type="application/json",
+                         headers={"Content-Encoding": encoding} if encoding else None)
+
+    return respond
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, nargs="+", default=[8, 50], help="live-pulse events per response")
+    parser.add_argument("--players", type=int, nargs="+", default=[11, 80], help="players in season stats")
+    parser.add_argument("--seconds", type=float, default=1.0, help="per measurement")
+    args = parser.parse_args()
+
+    payloads = [(f"live-pulse {n} events", live_pulse(n)) for n in args.events]
+    payloads += [(f"season-stats {n} players", season_stats(n)) for n in args.players]
+
+    print(f"orjson={'yes' if orjson else 'no'} brotli={'yes' if brotli else 'no'}  Accept-Encoding: {ACCEPT}")
+    print(f"{'payload':<26} {'per-request/s':>14} {'pre-rendered/s':>15} {'speedup':>8} "
+          f"{'identity B':>11} {'gzip B':>7} {'br B':>6}")
+    for name, payload in payloads:
+        before = rate(per_request(payload), args.seconds)
+        after = rate(pre_rendered(payload), args.seconds)
+        rendered = RenderCache().get("etag", lambda: payload)
+        print(f"{name:<26} {before:>14,.0f} {after:>15,.0f} {after / before:>7.1f}x "
+              f"{len(rendered.identity):>11} {len(rendered.gzip or b''):>7} {len(rendered.br or b''):>6}")
+
+
+if __name__ == "__main__":
+    main()
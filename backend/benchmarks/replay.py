@@ -0,0 +1,128 @@
+"""
+Replays recorded SofaScore responses through a fake tls_client.Session.
+
+Responses come from benchmarks/fixtures: recorded.json (exact URL paths captured with
+benchmarks.record) is preferred, and the per-endpoint templates fill in everything else.
+Templates use placeholders rendered per request:
+    "$PLAYER"     the player ID from the URL (or derived from the event ID); every replayed
+                  player is the only tracked player of a club with the same ID
+    "$EVENT:n"    a per-player event ID (player ID * 100 + n)
+    "$AGO:s"      a Unix timestamp s seconds before now
+    "$IN:s"       a Unix timestamp s seconds after now
+"""
+import json
+import random
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+ROUTES = [
+    (re.compile(r"/player/(\d+)/events/last/\d+$"), "events_last"),
+    (re.compile(r"/team/(\d+)/events/last/\d+$"), "events_last"),
+    (re.compile(r"/(?:player|team)/(\d+)/events/next/\d+$"), "events_next"),
+    (re.compile(r"/player/(\d+)$"), "player"),
+    (re.compile(r"/event/(\d+)/incidents$"), "incidents"),
+    (re.compile(r"/player/(\d+)/statistics/seasons$"), "statistics_seasons"),
+    (re.compile(r"/player/(\d+)/unique-tournament/\d+/season/\d+/statistics/overall$"), "statistics_overall"),
+]
+
+
+def _render(node: Any, player_id: int, now: int) -> Any:
+    if isinstance(node, dict):
+        return {k: _render(v, player_id, now) for k, v in node.items()}
+    if isinstance(node, list):
+        return [_render(v, player_id, now) for v in node]
+    if isinstance(node, str) and node.startswith("$"):
+        if node == "$PLAYER":
+            return player_id
+        if node.startswith("$EVENT:"):
+            return player_id * 100 + int(node[7:])
+        if node.startswith("$AGO:"):
+            return now - int(node[5:])
+        if node.startswith("$IN:"):
+            return now + int(node[4:])
+    return node
+
+
+def _rebase(body: Any, now: int) -> Any:
+    """Shift a recorded event list so its newest match kicked off three hours ago"""
+    events = body.get("events") if isinstance(body, dict) else None
+    if not events:
+        return body
+    shift = now - 3 * 3600 - max(e.get("startTimestamp", 0) for e in events)
+    return {**body, "events": [{**e, "startTimestamp": e.get("startTimestamp", 0) + shift} for e in events]}
+
+
+class ReplayResponse:
+    """Quacks like tls_client.response.Response"""
+
+    def __init__(self, status_code: int, body: Any = None, headers: Optional[dict] = None):
+        self.status_code = status_code
+        self.text = json.dumps(body if body is not None else {})
+        self.headers = headers or {}
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+class ReplaySession:
+    """
+    Stand-in for tls_client.Session with injected latency and errors.
+
+    latency: mean seconds per request (exponentially distributed around it when jitter is on)
+    error_rate: fraction of requests answered with error_status instead of the fixture
+    """
+
+    def __init__(self, latency: float = 0.05, jitter: bool = True, error_rate: float = 0.0,
+                 error_status: int = 503, seed: int = 0, fixtures_dir: Path = FIXTURES_DIR):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+        self.templates = {
+            name: json.loads((fixtures_dir / f"{name}.json").read_text())
+            for _, name in ROUTES
+        }
+        recorded = fixtures_dir / "recorded.json"
+        self.recorded = json.loads(recorded.read_text()) if recorded.exists() else {}
+
+    def _draw(self):
+        with self._lock:
+            self.calls += 1
+            delay = self._random.expovariate(1 / self.latency) if self.jitter and self.latency else self.latency
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        return delay, failed
+
+    def get(self, url: str, timeout_seconds: Optional[int] = None, **kwargs) -> ReplayResponse:
+        delay, failed = self._draw()
+        if delay:
+            time.sleep(delay)
+        if failed:
+            return ReplayResponse(self.error_status, {"error": {"code": self.error_status}})
+
+        path = url.split("/api/v1", 1)[-1]
+        now = int(time.time())
+
+        if path in self.recorded:
+            return ReplayResponse(200, _rebase(self.recorded[path], now))
+
+        for pattern, name in ROUTES:
+            match = pattern.search(path)
+            if match:
+                entity_id = int(match.group(1))
+                # Incidents are requested by event ID; template event IDs are player ID * 100 + n
+                player_id = entity_id // 100 if name == "incidents" else entity_id
+                return ReplayResponse(200, _render(self.templates[name], player_id, now))
+
+        return ReplayResponse(404, {"error": {"code": 404, "message": "Not Found"}})
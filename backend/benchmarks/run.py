@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite: replays recorded SofaScore responses (benchmarks/fixtures) through a
+fake tls_client.Session and measures the scraper and the FastAPI endpoints.
+
+Run from the backend directory:
+    python -m benchmarks.run --latency 0.05 --error-rate 0.02 --output bench.json
+    python -m benchmarks.run --compare bench.json      # print the change against a previous run
+
+Results are JSON so runs from different commits can be compared.
+"""
+import os
+
+# Never touch the on-disk response store or the live site; set before config is imported
+os.environ.setdefault("RESPONSE_STORE_PATH", ":memory:")
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+from benchmarks.replay import ReplaySession
+from cache import AsyncTTLCache
+from config import settings
+from response_store import ResponseStore
+from sofascore_scraper import SofaScoreScraper
+from transport import TLSClientTransport
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float, upstream_calls: int) -> Dict[str, float]:
+    ordered = sorted(latencies) or [0.0]
+
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(percentile(0.50), 3),
+        "p95_ms": round(percentile(0.95), 3),
+        "p99_ms": round(percentile(0.99), 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        "upstream_calls": upstream_calls,
+    }
+
+
+def make_scraper(session: ReplaySession, args) -> SofaScoreScraper:
+    return SofaScoreScraper(
+        max_concurrency=args.concurrency,
+        requests_per_second=args.rps,
+        response_store=ResponseStore(":memory:"),
+        transport=TLSClientTransport(max_workers=args.pool_size, session_factory=lambda: session),
+    )
+
+
+async def bench_scraper(name: str, call: Callable[[SofaScoreScraper], Awaitable], args) -> Dict[str, Dict]:
+    """Time `call` cold (fresh caches) and warm (same scraper again), over --iterations runs"""
+    results = {}
+    cold, warm = [], []
+    cold_calls = warm_calls = errors = 0
+
+    for i in range(args.iterations):
+        session = ReplaySession(latency=args.latency, error_rate=args.error_rate, seed=args.seed + i)
+        scraper = make_scraper(session, args)
+        for bucket in (cold, warm):
+            before = session.calls
+            start = time.perf_counter()
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    await call(scraper)
+            except Exception:
+                errors += 1
+            bucket.append(time.perf_counter() - start)
+            if bucket is cold:
+                cold_calls += session.calls - before
+            else:
+                warm_calls += session.calls - before
+        await scraper.transport.close()
+
+    results[f"{name}.cold"] = summarize(cold, errors, sum(cold), cold_calls)
+    results[f"{name}.warm"] = summarize(warm, 0, sum(warm), warm_calls)
+    return results
+
+
+async def bench_season_refresh(args) -> Dict[str, Dict]:
+    """
+    Season stats after every stored response has expired (the periodic refresh): per-competition
+    rows whose competition had no new match are reused instead of re-fetched
+    """
+    latencies, calls = [], 0
+    for i in range(args.iterations):
+        session = ReplaySession(latency=args.latency, error_rate=args.error_rate, seed=args.seed + i)
+        scraper = make_scraper(session, args)
+        await scraper.get_player_season_stats()
+        for path, stored in scraper.response_store.items().items():
+            scraper.response_store.put(path, stored.body, fetched_at=1.0)
+        scraper.season_stats_cache = AsyncTTLCache(ttl=settings.season_stats_ttl)
+
+        before = session.calls
+        start = time.perf_counter()
+        await scraper.get_player_season_stats()
+        latencies.append(time.perf_counter() - start)
+        calls += session.calls - before
+        await scraper.transport.close()
+    return {"scraper.season_stats.refresh": summarize(latencies, 0, sum(latencies), calls)}
+
+
+async def bench_endpoints(args) -> Dict[str, Dict]:
+    """Drive the real app through ASGI with --clients concurrent clients"""
+    import main
+
+    session = ReplaySession(latency=args.latency, error_rate=args.error_rate, seed=args.seed)
+    scraper = main.sofascore_scraper
+    scraper.transport = TLSClientTransport(max_workers=args.pool_size, session_factory=lambda: session)
+    scraper.rate_limiter.rate = args.rps
+
+    results = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with main.app.router.lifespan_context(main.app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for path in ("/api/live-pulse", "/api/season-stats"):
+                latencies: List[float] = []
+                errors = 0
+                before = session.calls
+
+                async def worker():
+                    nonlocal errors
+                    for _ in range(args.requests_per_client):
+                        start = time.perf_counter()
+                        response = await client.get(path)
+                        latencies.append(time.perf_counter() - start)
+                        if response.status_code != 200:
+                            errors += 1
+
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    await asyncio.gather(*(worker() for _ in range(args.clients)))
+                elapsed = time.perf_counter() - start
+                results[f"endpoint{path.replace('/api', '').replace('/', '.')}"] = summarize(
+                    latencies, errors, elapsed, session.calls - before
+                )
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def print_table(results: Dict[str, Dict], baseline: Dict[str, Dict] = None) -> None:
+    print(f"{'scenario':<28} {'reqs':>6} {'p50 ms':>9} {'p95 ms':>9} {'rps':>9} {'upstream':>9}")
+    for name, r in results.items():
+        line = f"{name:<28} {r['requests']:>6} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['throughput_rps']:>9.1f} {r['upstream_calls']:>9}"
+        if baseline and name in baseline and baseline[name]["p50_ms"]:
+            change = (r["p50_ms"] - baseline[name]["p50_ms"]) / baseline[name]["p50_ms"] * 100
+            line += f"   p50 {change:+.1f}%"
+        print(line)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.05, help="mean seconds per upstream request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of upstream requests that fail")
+    parser.add_argument("--iterations", type=int, default=3, help="scraper runs per scenario")
+    parser.add_argument("--clients", type=int, default=20, help="concurrent clients for endpoint scenarios")
+    parser.add_argument("--requests-per-client", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=6, help="scraper fetch-engine concurrency")
+    parser.add_argument("--rps", type=float, default=0, help="scraper request budget (0 = unlimited)")
+    parser.add_argument("--pool-size", type=int, default=8, help="transport executor threads")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict] = {}
+    results.update(await bench_scraper("scraper.live_events", lambda s: s.get_canadian_player_events(), args))
+    results.update(await bench_scraper("scraper.season_stats", lambda s: s.get_player_season_stats(), args))
+    results.update(await bench_season_refresh(args))
+    results.update(await bench_endpoints(args))
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        "results": results,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+    print_table(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
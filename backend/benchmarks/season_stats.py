@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark get_player_season_stats against a stubbed SofaScore transport.
+
+Run from the backend directory:
+    python -m benchmarks.season_stats --players 10 --tournaments 4 --latency 0.25
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import re
+import tempfile
+import time
+
+from transport import FakeTransport, TransportResponse
+from response_store import ResponseStore
+from roster import RosterRegistry
+from sofascore_scraper import SofaScoreScraper
+
+
+def stub_roster(players: int) -> RosterRegistry:
+    """Roster of N synthetic players with SofaScore IDs 1..N, written to a temp file"""
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump({"players": [
+            {"name": f"Player {i}", "ids": {"sofascore": i}} for i in range(1, players + 1)
+        ]}, f)
+    # Read once; the file is gone before the run, so never re-check it
+    registry = RosterRegistry(f.name, check_interval=float("inf"))
+    os.unlink(f.name)
+    return registry
+
+
+def stub_handler(tournaments: int):
+    """Synthetic 25/26 data: every player has the same M club competitions"""
+    def handler(url: str) -> TransportResponse:
+        if url.endswith("/statistics/seasons"):
+            return TransportResponse(200, {
+                "uniqueTournamentSeasons": [
+                    {
+                        "uniqueTournament": {"id": t, "name": f"League {t}"},
+                        "seasons": [{"id": 1000 + t, "name": "25/26", "team": {"name": "Stub FC"}}],
+                    }
+                    for t in range(1, tournaments + 1)
+                ]
+            })
+
+        if re.search(r"/unique-tournament/\d+/season/\d+/statistics/overall$", url):
+            return TransportResponse(200, {
+                "statistics": {"appearances": 10, "minutesPlayed": 800, "goals": 2, "assists": 1, "rating": 7.1}
+            })
+
+        return TransportResponse(404, {})
+
+    return handler
+
+
+async def run(players: int, tournaments: int, latency: float, concurrency: int, rps: float) -> tuple[float, int]:
+    transport = FakeTransport(stub_handler(tournaments), latency=latency)
+    scraper = SofaScoreScraper(
+        max_concurrency=concurrency,
+        requests_per_second=rps,
+        response_store=ResponseStore(":memory:"),
+        transport=transport,
+        roster=stub_roster(players)
+    )
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        stats = await scraper.get_player_season_stats()
+    elapsed = time.perf_counter() - start
+
+    assert len(stats) == players
+    return elapsed, transport.calls
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--tournaments", type=int, nargs="+", default=[1, 3, 5])
+    parser.add_argument("--latency", type=float, default=0.25, help="seconds per stubbed request")
+    parser.add_argument("--concurrency", type=int, default=6)
+    parser.add_argument("--rps", type=float, default=0, help="requests-per-second budget (0 = unlimited)")
+    args = parser.parse_args()
+
+    print(f"latency={args.latency}s concurrency={args.concurrency} rps={args.rps or 'unlimited'}")
+    print(f"{'players':>8} {'tourn.':>7} {'requests':>9} {'sequential':>11} {'concurrent':>11} {'speedup':>8}")
+
+    for n in args.players:
+        for m in args.tournaments:
+            # Concurrency 1 with no rate budget approximates the old one-at-a-time loop (minus its sleeps)
+            sequential, calls = await run(n, m, args.latency, 1, 0)
+            concurrent, _ = await run(n, m, args.latency, args.concurrency, args.rps)
+            print(f"{n:>8} {m:>7} {calls:>9} {sequential:>10.2f}s {concurrent:>10.2f}s {sequential / concurrent:>7.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
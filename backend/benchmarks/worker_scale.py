@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Live-pulse refresh cycle time as the number of scraper worker processes grows.
+
+Each worker is a separate process running ScraperWorker against the synthetic world of
+pool_scale (players spread over clubs, every tracked player scoring in their club's match),
+served as JSON text padded with old matches so parsing costs CPU as real SofaScore lists do.
+Workers register, wait until all N see each other, then scan their shard once (cold) and
+publish to a shared WorkerStore; the cycle time is the slowest worker's scan. "moved" is how
+many players change worker when one of the N dies (consistent hashing moves only its share).
+
+Run from the backend directory:
+    python -m benchmarks.worker_scale --players 400 --workers 1 2 4 --latency 0.05
+"""
+import os
+
+# Never touch the on-disk stores; set before config is imported (also in spawned workers)
+os.environ.setdefault("RESPONSE_STORE_PATH", ":memory:")
+# Keep every event, so the merged result can be checked to cover every player
+os.environ.setdefault("LIVE_PULSE_HISTORY_SIZE", "1000000")
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import tempfile
+import time
+
+from benchmarks.pool_scale import world_handler
+from benchmarks.season_stats import stub_roster
+from response_store import ResponseStore
+from scraper_worker import ScraperWorker, WorkerEventSource
+from shard_coordinator import HashRing
+from sofascore_scraper import SofaScoreScraper
+from transport import FakeTransport, TransportResponse
+from worker_store import WorkerStore
+
+
+def padded_handler(players: int, padding: int):
+    """world_handler with JSON text bodies; event lists carry `padding` extra finished matches from last season"""
+    handler, _, _ = world_handler(players)
+    filler = [
+        {"id": 900000 + i, "status": {"type": "finished"}, "startTimestamp": 1600000000 + i,
+         "tournament": {"name": "Stub League", "uniqueTournament": {"id": 1}}, "season": {"id": 0},
+         "homeTeam": {"name": f"Club {i}"}, "awayTeam": {"name": f"Club {i + 1}"},
+         "homeScore": {"current": 1}, "awayScore": {"current": 0}}
+        for i in range(padding)
+    ]
+    bodies = {}
+
+    def padded(url: str) -> TransportResponse:
+        # Serialized once per URL: the cost measured is the worker's parsing, not the stub's
+        if url not in bodies:
+            response = handler(url)
+            body = response.body
+            if response.status_code == 200 and "events" in body:
+                body = {"events": body["events"] + filler}
+            bodies[url] = TransportResponse(response.status_code, json.dumps(body))
+        return bodies[url]
+
+    return padded
+
+
+def run_worker(index: int, workers: int, args, store_path: str, response_path: str, results) -> None:
+    async def run() -> None:
+        transport = FakeTransport(padded_handler(args.players, args.padding), latency=args.latency)
+        scraper = SofaScoreScraper(
+            max_concurrency=args.concurrency,
+            requests_per_second=0,
+            response_store=ResponseStore(response_path),
+            transport=transport,
+            roster=stub_roster(args.players)
+        )
+        store = WorkerStore(store_path)
+        worker = ScraperWorker(scraper, store, f"worker-{index}", heartbeat_timeout=60)
+        worker.heartbeat()
+        # Start together, once every worker is in the membership table
+        while len(store.live_workers(60)) < workers:
+            await asyncio.sleep(0.01)
+        result = await worker.run_once()
+        results.put((index, result.cycle_seconds, len(worker.players), len(result.events), transport.calls))
+
+    asyncio.run(run())
+
+
+def run_pool(workers: int, args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        store_path = os.path.join(tmp, "workers.sqlite3")
+        response_path = os.path.join(tmp, "responses.sqlite3")
+        # Create the tables once, before the workers race to
+        WorkerStore(store_path).close()
+        ResponseStore(response_path).close()
+
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        processes = [
+            context.Process(target=run_worker, args=(i, workers, args, store_path, response_path, results))
+            for i in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        rows = [results.get(timeout=600) for _ in processes]
+        for process in processes:
+            process.join()
+
+        merged = asyncio.run(WorkerEventSource(WorkerStore(store_path), 600).get_canadian_player_events())
+
+    ids = [str(player_id) for player_id in range(1, args.players + 1)]
+    ring = HashRing([f"worker-{i}" for i in range(workers)])
+    survivors = HashRing([f"worker-{i}" for i in range(1, workers)]) if workers > 1 else None
+    return {
+        "cycle": max(row[1] for row in rows),
+        "shards": sorted(row[2] for row in rows),
+        "calls": sum(row[4] for row in rows),
+        "events": len(merged),
+        "moved": sum(ring.owner(key) != survivors.owner(key) for key in ids) if survivors else 0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=400)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per stubbed request")
+    parser.add_argument("--padding", type=int, default=300, help="extra matches per event list (parse cost)")
+    parser.add_argument("--concurrency", type=int, default=6, help="requests in flight per worker")
+    args = parser.parse_args()
+
+    print(f"players={args.players} latency={args.latency}s padding={args.padding} concurrency={args.concurrency}/worker")
+    print(f"{'workers':>8} {'cycle s':>8} {'calls':>6} {'events':>7} {'moved':>6}  shard sizes")
+    for workers in args.workers:
+        start = time.perf_counter()
+        pool = run_pool(workers, args)
+        assert pool["events"] == args.players, (pool["events"], args.players)
+        print(f"{workers:>8} {pool['cycle']:>8.2f} {pool['calls']:>6} {pool['events']:>7} {pool['moved']:>6}  "
+              f"{pool['shards']}  (wall {time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from metrics import REFRESH_DURATION
+from singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry:
+    __slots__ = ("value", "stored_at")
+
+    def __init__(self, value: Any, stored_at: float):
+        self.value = value
+        self.stored_at = stored_at
+
+
+class AsyncTTLCache:
+    """
+    In-memory async cache with a per-entry TTL and stale-while-revalidate.
+
+    - Fresh entries are returned directly (hit).
+    - Stale entries are returned at once while a single background refresh runs (stale).
+    - Missing entries are loaded; concurrent misses for the same key share one load (single-flight).
+    - The least recently used entry is evicted once max_entries is exceeded.
+    Failed loads are never cached, so a stale entry survives an upstream error.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 256, name: Optional[str] = None):
+        self.ttl = ttl
+        self.name = name or "cache"
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._flight = SingleFlight(self.name)
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if time.monotonic() - entry.stored_at < self.ttl:
+                self.hits += 1
+            else:
+                self.stale += 1
+                self._load(key, loader)
+            return entry.value
+
+        self.misses += 1
+        # Shielded so one cancelled caller doesn't cancel a load other callers are waiting on
+        return await asyncio.shield(self._load(key, loader))
+
+    def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Start a load for key unless one is already in flight"""
+        return self._flight.start(key, lambda: self._fill(key, loader))
+
+    async def _fill(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            with REFRESH_DURATION.time(self.name):
+                value = await loader()
+        except Exception as e:
+            # Logged here so background refresh failures, which nobody awaits, don't go unreported
+            logger.warning("%s load failed for %r: %s", self.name, key, e)
+            raise
+        self._entries[key] = _Entry(value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def is_stale(self, key: Hashable) -> bool:
+        """Whether key has an entry past its TTL (the next get serves it while refreshing)"""
+        entry = self._entries.get(key)
+        return entry is not None and time.monotonic() - entry.stored_at >= self.ttl
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.stale
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "hit_ratio": round((self.hits + self.stale) / lookups, 4) if lookups else 0.0,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "refreshing": len(self._flight),
+            "collapsed": self._flight.collapsed
+        }
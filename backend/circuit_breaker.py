@@ -0,0 +1,88 @@
+import logging
+import time
+from typing import Optional
+
+from metrics import CIRCUIT_STATE
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    """
+    Stops calls to an upstream that keeps failing. After `failure_threshold` consecutive
+    failures the circuit opens and every call is refused for `reset_timeout` seconds; then a
+    single probe is let through (half-open) and its outcome closes or re-opens the circuit.
+    Callers serve their last good data while the circuit is not closed.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.last_failure: Optional[str] = None
+        self.rejected = 0
+        # monotonic start of the half-open probe in flight, if any
+        self._probe_started: Optional[float] = None
+        CIRCUIT_STATE.set(_STATE_VALUES[CLOSED], name)
+
+    def _transition(self, state: str) -> None:
+        if state != self.state:
+            logger.warning("Circuit %s: %s -> %s", self.name, self.state, state)
+        self.state = state
+        CIRCUIT_STATE.set(_STATE_VALUES[state], self.name)
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now; at most one probe runs while half-open"""
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._transition(HALF_OPEN)
+        if self.state == CLOSED:
+            return True
+        # A probe that never reported back (e.g. cancelled) doesn't block the next one forever
+        now = time.monotonic()
+        if self.state == HALF_OPEN and (
+            self._probe_started is None or now - self._probe_started >= self.reset_timeout
+        ):
+            self._probe_started = now
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._probe_started = None
+        if self.state != CLOSED:
+            self._transition(CLOSED)
+            self.opened_at = None
+
+    def record_failure(self, reason: str) -> None:
+        self.failures += 1
+        self.last_failure = reason
+        self._probe_started = None
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._transition(OPEN)
+
+    def retry_in(self) -> float:
+        """Seconds until the next probe is allowed (0 unless open)"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def status(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "failure_threshold": self.failure_threshold,
+            "retry_in_seconds": round(self.retry_in(), 1),
+            "last_failure": self.last_failure,
+            "rejected_calls": self.rejected,
+        }
@@ -0,0 +1,93 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+
+from rendered import RenderedBody, dumps
+
+
+def content_hash(content: Any) -> str:
+    """Stable digest of JSON-compatible content (key order doesn't matter)"""
+    return hashlib.blake2b(dumps(content, sort_keys=True), digest_size=12).hexdigest()
+
+
+def weak_etag(*parts: Any) -> str:
+    """
+    Weak ETag over the given parts. Weak because bodies with the same ETag are equivalent,
+    not byte-identical: e.g. season-stats' last_updated is when this process first saw the
+    stats, and the body may be sent gzip or br encoded.
+    """
+    return f'W/"{content_hash(parts)}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses the weak comparison: W/"x" and "x" match"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    """
+    Whether the client's copy is current. If-None-Match takes precedence; If-Modified-Since
+    is only checked when the request has no If-None-Match (RFC 9110 13.2.2).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have one-second resolution
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def cached_response(request: Request, render: Callable[[], RenderedBody], etag: str,
+                    last_modified: datetime, max_age: int) -> Response:
+    """
+    Pre-rendered JSON response with ETag, Last-Modified and Cache-Control, compressed as
+    Accept-Encoding allows, or an empty 304 when the client already has this version
+    (render is then never called).
+    """
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified.astimezone(timezone.utc), usegmt=True),
+        "Cache-Control": f"public, max-age={max_age}",
+        "Vary": "Accept-Encoding"
+    }
+    if not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    body, encoding = render().negotiate(request.headers.get("accept-encoding"))
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type="application/json", headers=headers)
+
+
+class ChangeClock:
+    """
+    When each keyed payload last changed: remembers the hash last seen per key and the
+    time it first appeared, for Last-Modified of payloads rebuilt on every request.
+    """
+
+    def __init__(self, max_keys: int = 512):
+        self.max_keys = max_keys
+        self._seen: Dict[Hashable, Tuple[str, datetime]] = {}
+
+    def observe(self, key: Hashable, digest: str) -> datetime:
+        seen = self._seen.get(key)
+        if seen is not None and seen[0] == digest:
+            return seen[1]
+        if seen is None and len(self._seen) >= self.max_keys:
+            self._seen.pop(next(iter(self._seen)))
+        changed_at = datetime.now(timezone.utc)
+        self._seen[key] = (digest, changed_at)
+        return changed_at
@@ -9,9 +9,95 @@ class Settings(BaseSettings):
     # Optional RapidAPI settings (for future use)
     rapidapi_key: Optional[str] = None
     rapidapi_host: str = "api-football-v1.p.rapidapi.com"
+    # RapidAPI enforces a per-minute quota; stay under it and cap requests in flight
+    rapidapi_requests_per_minute: int = 30
+    rapidapi_max_concurrency: int = 5
+    
+    # SofaScore fetch engine: max requests in flight and global request budget
+    sofascore_max_concurrency: int = 6
+    sofascore_requests_per_second: float = 8.0
+    # Throttling (429/403) halves the request rate down to this floor; successes raise it back
+    sofascore_min_requests_per_second: float = 0.5
+    # Retries per request on throttling, 5xx or transport errors (jittered exponential backoff)
+    sofascore_max_retries: int = 3
+    sofascore_backoff_base: float = 0.5
+    sofascore_backoff_max: float = 30.0
+    # Circuit breaker: consecutive failures before upstream calls stop, seconds before a probe
+    sofascore_breaker_threshold: int = 5
+    sofascore_breaker_reset: float = 60.0
+    
+    # SofaScore HTTP transport: "tls_client" (browser TLS fingerprint) or "httpx" (async pool)
+    sofascore_transport: str = "tls_client"
+    sofascore_pool_size: int = 8
+    sofascore_keepalive_expiry: float = 30.0
+    sofascore_timeout: float = 10.0
+    
+    # Live pulse scans one event list per club with tracked players (club from /player/{id},
+    # re-read every sofascore_team_ttl seconds) instead of one per player
+    sofascore_batch_by_club: bool = True
+    sofascore_team_ttl: int = 86400
+    # SofaScore team ID of the national team, scanned too (club lists miss international matches)
+    sofascore_national_team_id: Optional[int] = None
+    
+    # Schedule index: clubs' event lists are re-read every schedule_ttl seconds, and on every
+    # poll only from kickoff until the match is finished (or schedule_active_window seconds pass)
+    schedule_ttl: int = 21600
+    schedule_active_window: int = 10800
+    
+    # Live pulse background refresh (seconds): while a tracked match is live / otherwise
+    live_pulse_live_interval: int = 20
+    live_pulse_idle_interval: int = 300
+    # Most recent events kept per snapshot; /api/live-pulse pages through them with limit/before
+    live_pulse_history_size: int = 50
+    # Several workers: the one holding the lock file scrapes and shares snapshots through the
+    # response store's SQLite file; the others read them every live_pulse_sync_interval seconds
+    live_pulse_shared: bool = True
+    live_pulse_lock_path: str = "live_pulse.lock"
+    live_pulse_sync_interval: float = 2.0
+    # "scraper" scans SofaScore in the API process; "workers" merges the results of standalone
+    # scraper workers (python scraper_worker.py), which split the roster between them
+    live_pulse_source: str = "scraper"
+    # Scraper workers heartbeat this often; one silent for scraper_worker_timeout seconds is
+    # considered dead and its players move to the others
+    scraper_worker_heartbeat_interval: float = 5.0
+    scraper_worker_timeout: float = 20.0
+    
+    # Season stats cache: seconds before an entry is stale, and max players kept
+    season_stats_ttl: int = 1800
+    season_stats_cache_size: int = 256
+    
+    # Cache-Control max-age (seconds) on /api/live-pulse and /api/season-stats responses; both
+    # carry an ETag and Last-Modified, and conditional requests get 304 while nothing changed
+    live_pulse_max_age: int = 10
+    season_stats_max_age: int = 60
+    
+    # Latency budgets (seconds, 0 = no limit; ?budget= overrides per request). /api/season-stats
+    # answers with the players ready by then and lists the rest as missing; /api/live-pulse serves
+    # the last snapshot if none is ready. Each phase of a live-pulse scan (club lookups, event
+    # lists, match incidents) gets live_pulse_scan_budget seconds; players not read in time are
+    # marked missing and keep their previous events.
+    # Unfinished fetches keep running in the background and fill the caches for the next request.
+    season_stats_budget: float = 2.0
+    live_pulse_budget: float = 1.0
+    live_pulse_scan_budget: float = 10.0
+    
+    # Persistent SofaScore response store and freshness of live/season bodies (seconds)
+    # Finished-match incidents are kept forever
+    response_store_path: str = "sofascore_cache.sqlite3"
+    live_response_ttl: int = 30
+    season_response_ttl: int = 600
+    # Per-competition season rows are re-fetched when the player's team finishes a match in that
+    # competition, and at least this often (seconds) to pick up SofaScore's post-match corrections
+    season_row_max_age: int = 86400
+    
+    # Tracked players and their per-provider IDs; edits are picked up within roster_check_interval seconds
+    roster_path: str = "data/roster.json"
+    roster_check_interval: float = 5.0
     
     port: int = 8000
     environment: str = "development"
+    # DEBUG logs every fetch and match found; INFO and above keeps the hot path quiet
+    log_level: str = "INFO"
 
     class Config:
         env_file = ".env"
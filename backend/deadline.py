@@ -0,0 +1,36 @@
+import asyncio
+from typing import Any, Awaitable, Iterable, List, Optional
+
+
+class DeadlineExceeded(Exception):
+    """Placeholder result of an awaitable that wasn't done within the budget"""
+
+
+def _retrieve(task: asyncio.Future) -> None:
+    # Nobody awaits a task left running past the deadline; don't report its error as never retrieved
+    if not task.cancelled():
+        task.exception()
+
+
+async def gather_within(aws: Iterable[Awaitable[Any]], timeout: Optional[float]) -> List[Any]:
+    """
+    Like asyncio.gather(..., return_exceptions=True), but returns after at most `timeout`
+    seconds: awaitables not done by then come back as DeadlineExceeded and keep running in the
+    background, so their fetches still fill the caches for the next call.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    if not tasks:
+        return []
+    done, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.add_done_callback(_retrieve)
+
+    results = []
+    for task in tasks:
+        if task in pending:
+            results.append(DeadlineExceeded())
+        elif task.cancelled():
+            results.append(asyncio.CancelledError())
+        else:
+            results.append(task.exception() or task.result())
+    return results
@@ -0,0 +1,78 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+from models import PlayerEvent
+
+
+def event_content(event: PlayerEvent) -> dict:
+    return event.model_dump()
+
+
+@dataclass(frozen=True)
+class EventDelta:
+    added: Tuple[PlayerEvent, ...]
+    updated: Tuple[PlayerEvent, ...]
+    removed: Tuple[str, ...]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+
+def diff_events(previous: Dict[str, PlayerEvent], current: Dict[str, PlayerEvent]) -> EventDelta:
+    """Compare two {event id: event} snapshots"""
+    added = tuple(event for event_id, event in current.items() if event_id not in previous)
+    updated = tuple(
+        event for event_id, event in current.items()
+        if event_id in previous and event_content(previous[event_id]) != event_content(event)
+    )
+    # e.g. a goal cancelled by VAR disappears from the incident list
+    removed = tuple(event_id for event_id in previous if event_id not in current)
+    return EventDelta(added, updated, removed)
+
+
+class EventDiffer:
+    """
+    Versioned live-pulse snapshots keyed by stable event ID.
+
+    Each apply() that changes anything bumps the version (the client cursor). A bounded
+    history of past snapshots lets since() return the combined delta from any recent
+    cursor to now; older or unknown cursors return None and the client resyncs in full.
+    """
+
+    def __init__(self, history_size: int = 64):
+        self.history_size = history_size
+        self.version = 0
+        self._snapshots: "OrderedDict[int, Dict[str, PlayerEvent]]" = OrderedDict({0: {}})
+
+    @property
+    def current(self) -> Dict[str, PlayerEvent]:
+        return self._snapshots[self.version]
+
+    def apply(self, events: Iterable[PlayerEvent]) -> EventDelta:
+        snapshot = {event.id: event for event in events}
+        delta = diff_events(self.current, snapshot)
+        if delta:
+            self.version += 1
+            self._snapshots[self.version] = snapshot
+            while len(self._snapshots) > self.history_size:
+                self._snapshots.popitem(last=False)
+        return delta
+
+    def load(self, version: int, events: Iterable[PlayerEvent]) -> EventDelta:
+        """
+        Adopt a snapshot numbered elsewhere (a follower replaying the leader's versions),
+        so cursors are the same on every worker. Returns the change from the current snapshot.
+        """
+        snapshot = {event.id: event for event in events}
+        delta = diff_events(self.current, snapshot)
+        self.version = version
+        self._snapshots[version] = snapshot
+        while len(self._snapshots) > self.history_size:
+            self._snapshots.popitem(last=False)
+        return delta
+
+    def since(self, cursor: int) -> Optional[EventDelta]:
+        previous = self._snapshots.get(cursor)
+        if previous is None:
+            return None
+        return diff_events(previous, self.current)
@@ -0,0 +1,96 @@
+import asyncio
+import json
+from typing import AsyncIterator, Callable, Iterable, List, Optional, Set, Tuple
+from models import PlayerEvent
+from event_diff import EventDelta
+
+
+class Subscriber:
+    """One stream connection: a bounded queue of pre-serialized SSE messages"""
+
+    def __init__(self, queue_size: int):
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=queue_size)
+        # Set when the client fell too far behind; it is disconnected and resumes via Last-Event-ID
+        self.overflowed = False
+
+
+def sse_messages(version: int, events: Iterable[PlayerEvent], removed_ids: Iterable[str] = ()) -> List[str]:
+    """
+    SSE messages for one snapshot version's changes. Only the last message carries `id:` (the
+    version), so a client cut off mid-batch resumes from the previous version and gets all of it.
+    """
+    messages = [("player-event", event.model_dump_json()) for event in events]
+    messages += [("player-event-removed", json.dumps({"id": event_id})) for event_id in removed_ids]
+    return [
+        (f"id: {version}\n" if i == len(messages) - 1 else "") + f"event: {event_type}\ndata: {data}\n\n"
+        for i, (event_type, data) in enumerate(messages)
+    ]
+
+
+class EventBroadcaster:
+    """
+    Fan-out of live-pulse changes to Server-Sent Events subscribers.
+
+    The poller publishes only new, changed or removed events; each is serialized once into an SSE
+    message whose ID is the snapshot version (the live-pulse `cursor`). Versions are shared by every
+    worker, so a reconnecting client resumes from Last-Event-ID on any of them: the backlog is the
+    poller's delta since that version, not a per-process history. Subscribers never trigger a
+    scrape, so idle connections cost only a queue. A subscriber whose queue fills up is dropped
+    instead of buffering without bound (per-connection backpressure).
+    """
+
+    def __init__(self, queue_size: int = 64, keepalive: float = 15.0):
+        self.queue_size = queue_size
+        self.keepalive = keepalive
+        self._subscribers: Set[Subscriber] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, version: int, events: Iterable[PlayerEvent], removed_ids: Iterable[str] = ()) -> None:
+        """Push a version's added/updated events, and the IDs of events that disappeared (e.g. a goal cancelled by VAR)"""
+        for message in sse_messages(version, events, removed_ids):
+            for subscriber in list(self._subscribers):
+                try:
+                    subscriber.queue.put_nowait(message)
+                except asyncio.QueueFull:
+                    subscriber.overflowed = True
+                    self._subscribers.discard(subscriber)
+
+    async def stream(self, last_event_id: Optional[int] = None,
+                     replay: Callable[[int], Tuple[int, Optional[EventDelta]]] = None) -> AsyncIterator[str]:
+        """
+        Yield SSE messages for one connection until the client disconnects or falls behind.
+        replay(last_event_id) returns the current version and the delta since last_event_id, or
+        None as the delta if the client must resync from /api/live-pulse.
+        """
+        subscriber = Subscriber(self.queue_size)
+        # Computed and registered together, with no await in between, so nothing published is missed
+        resumed = replay(last_event_id) if last_event_id is not None and replay is not None else None
+        self._subscribers.add(subscriber)
+
+        try:
+            if resumed is not None:
+                version, delta = resumed
+                if delta is None:
+                    yield f"id: {version}\nevent: reset\ndata: {{}}\n\n"
+                else:
+                    for message in sse_messages(version, delta.added + delta.updated, delta.removed):
+                        yield message
+
+            while not subscriber.overflowed:
+                try:
+                    yield await asyncio.wait_for(subscriber.queue.get(), timeout=self.keepalive)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+
+            # Drain what was queued before the overflow, then let the client reconnect
+            while not subscriber.queue.empty():
+                yield subscriber.queue.get_nowait()
+        finally:
+            self._subscribers.discard(subscriber)
+
+
+live_pulse_broadcaster = EventBroadcaster()
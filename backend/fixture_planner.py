@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Set
+
+from roster import Player, normalize_name
+
+
+# API-Football short statuses after which a fixture's events no longer change
+FINISHED_STATUSES = {"FT", "AET", "PEN", "AWD", "WO", "CANC", "ABD"}
+
+
+class TeamIndex:
+    """Tracked clubs by API-Football team ID, with normalized names as a fallback"""
+
+    def __init__(self, players: Iterable[Player]):
+        players = list(players)
+        self.team_ids: Set[int] = {p.team_id for p in players if p.team_id}
+        self.team_names: Set[str] = {normalize_name(p.team) for p in players if p.team}
+
+    def involves(self, fixture: dict) -> bool:
+        """True if either side of the fixture is a tracked player's club"""
+        teams = fixture.get("teams", {})
+        for side in ("home", "away"):
+            team = teams.get(side, {})
+            if team.get("id") in self.team_ids or normalize_name(team.get("name", "")) in self.team_names:
+                return True
+        return False
+
+
+@dataclass
+class PlanReport:
+    """Upstream calls for one cycle, compared with fetching events for every fixture in the window"""
+    fixtures_seen: int = 0
+    fixtures_tracked: int = 0
+    events_cached: int = 0
+    calls_made: int = 0
+
+    @property
+    def calls_naive(self) -> int:
+        # Two fixture listings plus one /fixtures/events call per fixture seen
+        return 2 + self.fixtures_seen
+
+    @property
+    def calls_saved(self) -> int:
+        return self.calls_naive - self.calls_made
+
+
+class FixturePlanner:
+    """
+    Decides which /fixtures/events calls a cycle needs.
+
+    API-Football has no filter that returns "live or recent fixtures for these N teams" in one
+    call (team queries are one team at a time, and league filters miss cup matches), so the
+    listings stay at two calls: live=all and the date window. The savings come after that:
+    events are fetched only for fixtures involving a tracked club, and a finished fixture's
+    events are fetched once and reused on later cycles.
+    """
+
+    def __init__(self, team_index: TeamIndex, max_cached_fixtures: int = 512):
+        self.team_index = team_index
+        self.max_cached_fixtures = max_cached_fixtures
+        self._finished_events: Dict[int, List[dict]] = {}
+        self.last_report = PlanReport()
+
+    def select(self, fixtures: Iterable[dict]) -> Dict[int, dict]:
+        """Deduplicate fixtures by ID and keep the tracked ones"""
+        all_fixtures = {f["fixture"]["id"]: f for f in fixtures}
+        tracked = {fixture_id: f for fixture_id, f in all_fixtures.items() if self.team_index.involves(f)}
+        self.last_report = PlanReport(fixtures_seen=len(all_fixtures), fixtures_tracked=len(tracked), calls_made=2)
+        return tracked
+
+    def cached_events(self, fixture_id: int):
+        events = self._finished_events.get(fixture_id)
+        if events is not None:
+            self.last_report.events_cached += 1
+        return events
+
+    def record_events(self, fixture: dict, events: List[dict]) -> None:
+        self.last_report.calls_made += 1
+        if fixture["fixture"].get("status", {}).get("short") in FINISHED_STATUSES and events:
+            self._finished_events[fixture["fixture"]["id"]] = events
+            while len(self._finished_events) > self.max_cached_fixtures:
+                self._finished_events.pop(next(iter(self._finished_events)))
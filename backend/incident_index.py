@@ -0,0 +1,135 @@
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, FrozenSet, List, Tuple
+
+from singleflight import SingleFlight
+
+
+@dataclass(frozen=True)
+class PlayerIncident:
+    """One tracked player's involvement in a match incident"""
+    player_id: int
+    incident_key: str
+    type: str
+    name: str
+    minute: int
+    is_home: bool
+    # Stoppage-time minutes on top of `minute` (45+2 -> minute 45, added_time 2)
+    added_time: int = 0
+
+
+def incident_key(incident: dict) -> str:
+    """SofaScore's incident ID when present, otherwise a key built from its type and match clock"""
+    if incident.get("id") is not None:
+        return str(incident["id"])
+    return f"{incident.get('incidentType', '')}-{incident.get('time', 0)}-{incident.get('addedTime', 0)}"
+
+
+def resolve_incidents(incidents: List[dict], tracked_ids: FrozenSet[int]) -> Dict[int, List[PlayerIncident]]:
+    """
+    Resolve goals, assists, cards and substitutions for every tracked player in one pass
+    over a match's incidents. Returns {sofascore player id: incidents in match order}.
+    """
+    resolved: Dict[int, List[PlayerIncident]] = defaultdict(list)
+
+    for incident in incidents:
+        incident_player = incident.get("player", {})
+        if not incident_player:
+            continue
+
+        incident_player_id = incident_player.get("id")
+        key = incident_key(incident)
+        minute = incident.get("time", 0)
+        added_time = incident.get("addedTime") or 0
+        is_home = incident.get("isHome", False)
+
+        if incident_player_id in tracked_ids:
+            incident_type = incident.get("incidentType", "")
+            event_type = event_name = None
+
+            if incident_type == "goal":
+                event_type, event_name = "goal", "Goal"
+            elif incident_type == "yellowCard":
+                event_type, event_name = "card", "Yellow Card"
+            elif incident_type == "redCard":
+                event_type, event_name = "card", "Red Card"
+            elif incident_type == "substitution":
+                if incident.get("playerIn", {}).get("id") == incident_player_id:
+                    event_type, event_name = "substitution", "Substitution"
+
+            if event_type:
+                resolved[incident_player_id].append(
+                    PlayerIncident(incident_player_id, key, event_type, event_name, minute, is_home, added_time)
+                )
+
+        # The assisting player is credited whenever it isn't the incident's own player
+        assist_id = incident.get("assist1", {}).get("id")
+        if assist_id in tracked_ids and assist_id != incident_player_id:
+            resolved[assist_id].append(PlayerIncident(assist_id, key, "assist", "Assist", minute, is_home, added_time))
+
+    return dict(resolved)
+
+
+class _MatchEntry:
+    __slots__ = ("incidents", "finished", "fetched_at", "tracked_ids", "resolved")
+
+    def __init__(self, incidents: List[dict], finished: bool, tracked_ids: FrozenSet[int]):
+        self.incidents = incidents
+        self.finished = finished
+        self.fetched_at = time.monotonic()
+        self.tracked_ids = tracked_ids
+        self.resolved = resolve_incidents(incidents, tracked_ids)
+
+
+class IncidentIndex:
+    """
+    Incidents resolved per SofaScore event ID, shared by every tracked player in the match
+    and reused across polls.
+
+    Finished matches are immutable, so once fetched after the final whistle they are kept
+    (LRU-bounded). Matches still in progress are reused for live_ttl seconds. Concurrent
+    lookups of the same match share one fetch. fetch_incidents returns the incidents and
+    whether they are final (fetched after the match finished, not a live-era body served
+    during an outage).
+    """
+
+    def __init__(self, fetch_incidents: Callable[[int, bool], Awaitable[Tuple[List[dict], bool]]],
+                 live_ttl: float, max_matches: int = 512):
+        self.fetch_incidents = fetch_incidents
+        self.live_ttl = live_ttl
+        self.max_matches = max_matches
+        self._matches: "OrderedDict[int, _MatchEntry]" = OrderedDict()
+        self._flight = SingleFlight("match_incidents")
+
+    async def get(self, event_id: int, finished: bool, tracked_ids: FrozenSet[int]) -> Dict[int, List[PlayerIncident]]:
+        entry = self._matches.get(event_id)
+        if entry is None or not self._is_fresh(entry, finished):
+            entry = await self._load(event_id, finished, tracked_ids)
+
+        self._matches.move_to_end(event_id)
+        # Roster changed since this match was resolved: re-resolve without refetching
+        if entry.tracked_ids != tracked_ids:
+            entry.tracked_ids = tracked_ids
+            entry.resolved = resolve_incidents(entry.incidents, tracked_ids)
+        return entry.resolved
+
+    def _is_fresh(self, entry: _MatchEntry, finished: bool) -> bool:
+        if entry.finished:
+            return True
+        # A match that has just finished needs one final fetch
+        return not finished and time.monotonic() - entry.fetched_at < self.live_ttl
+
+    async def _load(self, event_id: int, finished: bool, tracked_ids: FrozenSet[int]) -> _MatchEntry:
+        return await self._flight.do(event_id, lambda: self._fill(event_id, finished, tracked_ids))
+
+    async def _fill(self, event_id: int, finished: bool, tracked_ids: FrozenSet[int]) -> _MatchEntry:
+        incidents, final = await self.fetch_incidents(event_id, finished)
+        entry = _MatchEntry(incidents, final, tracked_ids)
+        self._matches[event_id] = entry
+        while len(self._matches) > self.max_matches:
+            self._matches.popitem(last=False)
+        return entry
+
+    def __len__(self) -> int:
+        return len(self._matches)
@@ -0,0 +1,50 @@
+import logging
+import os
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, every process acts as leader
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderLock:
+    """
+    Leader election between worker processes on one host through an exclusive flock on a
+    lock file. The holder keeps the lock for its lifetime; when it exits or crashes the OS
+    releases it and the next try_acquire() in another process takes over. Non-blocking,
+    so followers just retry on their own schedule.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._fd is not None or fcntl is None
+
+    def try_acquire(self) -> bool:
+        """Become leader if no other process is; True if this process holds the lock"""
+        if self.is_leader:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        # The PID is informational only (the flock is what counts)
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        logger.info("Process %d is now the live pulse leader (%s)", os.getpid(), self.path)
+        return True
+
+    def release(self) -> None:
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
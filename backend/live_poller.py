@@ -0,0 +1,275 @@
+import asyncio
+import logging
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from models import PlayerEvent
+from config import settings
+from sofascore_scraper import SofaScoreScraper, SofaScoreUnavailable, sofascore_scraper
+from event_stream import EventBroadcaster, live_pulse_broadcaster
+from event_diff import EventDelta, EventDiffer, event_content
+from conditional import content_hash
+from snapshot_store import SnapshotStore, StoredSnapshot
+from leader import LeaderLock
+from scraper_worker import WorkerEventSource
+from worker_store import WorkerStore
+from metrics import REFRESH_DURATION
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LivePulseSnapshot:
+    """Immutable result of one refresh cycle, swapped in atomically by the poller"""
+    events: Tuple[PlayerEvent, ...]
+    fetched_at: datetime
+    has_live_match: bool
+    # EventDiffer version of these events; clients send it back as the `since` cursor
+    version: int
+    # Hash of the events' content and when it last changed, for ETag / Last-Modified
+    content_hash: str
+    changed_at: datetime
+    # Tracked players whose events may be incomplete: their lists weren't read within the scan budget
+    missing: Tuple[str, ...] = ()
+    # Published empty because SofaScore was unavailable before any events were fetched
+    unavailable: bool = False
+
+
+class LivePulsePoller:
+    """
+    Background task that scrapes live-pulse events on its own schedule and publishes
+    the latest snapshot, so request handlers never scrape inline. Each snapshot is diffed
+    against the previous one, and the changes are pushed to stream subscribers.
+    Polls every live_interval seconds while a tracked player's match is in progress,
+    and every idle_interval seconds otherwise (or at the next kickoff, if sooner).
+
+    With a shared store and leader lock (several workers), only the process holding the
+    lock scrapes and writes each snapshot to the store; the others read it back every
+    sync_interval seconds and take over scraping if the leader goes away.
+    """
+
+    def __init__(self, scraper: SofaScoreScraper, broadcaster: EventBroadcaster = None,
+                 live_interval: float = None, idle_interval: float = None,
+                 store: SnapshotStore = None, leader: LeaderLock = None, sync_interval: float = None):
+        self.scraper = scraper
+        self.broadcaster = broadcaster
+        self.live_interval = live_interval or settings.live_pulse_live_interval
+        self.idle_interval = idle_interval or settings.live_pulse_idle_interval
+        self.store = store
+        self.leader = leader
+        self.sync_interval = sync_interval or settings.live_pulse_sync_interval
+        self.differ = EventDiffer()
+        self.snapshot: Optional[LivePulseSnapshot] = None
+        self._leading = False
+        self._published = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="live-pulse-poller")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.leader is not None:
+            # Let a follower take over now rather than when this process exits
+            self.leader.release()
+            self._leading = False
+
+    async def get_snapshot(self) -> LivePulseSnapshot:
+        """Return the current snapshot, waiting for the first refresh if none exists yet"""
+        if self.snapshot is None:
+            await self._published.wait()
+        return self.snapshot
+
+    async def refresh(self) -> LivePulseSnapshot:
+        """Scrape once and publish the result"""
+        unavailable = False
+        with REFRESH_DURATION.time("live_pulse"):
+            try:
+                events = await self.scraper.get_canadian_player_events()
+            except SofaScoreUnavailable:
+                # Keep the last good snapshot; with none yet, publish an empty one so readers aren't held
+                if self.snapshot is not None:
+                    raise
+                events, unavailable = [], True
+        events = self._carry_missing(events)
+        previous = self.snapshot
+        delta = self.differ.apply(events)
+        fetched_at = datetime.now(timezone.utc)
+        unchanged = previous is not None and previous.version == self.differ.version
+        self.snapshot = LivePulseSnapshot(
+            events=tuple(events),
+            fetched_at=fetched_at,
+            has_live_match=bool(self.scraper.live_event_ids),
+            version=self.differ.version,
+            content_hash=previous.content_hash if unchanged else content_hash([event_content(e) for e in events]),
+            changed_at=previous.changed_at if unchanged else fetched_at,
+            missing=tuple(self.scraper.missing_players),
+            unavailable=unavailable
+        )
+        self._published.set()
+        if self.store is not None:
+            self.store.put(StoredSnapshot(
+                version=self.snapshot.version,
+                events=[event.model_dump() for event in events],
+                fetched_at=self.snapshot.fetched_at.timestamp(),
+                changed_at=self.snapshot.changed_at.timestamp(),
+                has_live_match=self.snapshot.has_live_match,
+                content_hash=self.snapshot.content_hash,
+                missing=list(self.snapshot.missing),
+                unavailable=unavailable
+            ))
+        
+        # The first snapshot is the baseline clients fetch from /api/live-pulse; push only what changes after it
+        if self.broadcaster is not None and previous is not None and delta:
+            self.broadcaster.publish(self.snapshot.version, delta.added + delta.updated, delta.removed)
+        return self.snapshot
+
+    def _carry_missing(self, events: List[PlayerEvent]) -> List[PlayerEvent]:
+        """
+        Keep the previous snapshot's events of players the scan couldn't read in time (missing),
+        so a slow source doesn't turn into removals pushed to stream clients
+        """
+        missing = set(self.scraper.missing_players)
+        if not missing or self.snapshot is None:
+            return events
+        ids = {event.id for event in events}
+        carried = [event for event in self.snapshot.events if event.player in missing and event.id not in ids]
+        if not carried:
+            return events
+        # Same order as the scan's time-order key: kickoff, then time in the match
+        merged = sorted(
+            list(events) + carried, key=lambda event: (event.kickoff_at or 0, event.occurred_at or 0, event.id),
+            reverse=True
+        )
+        return merged[:settings.live_pulse_history_size]
+
+    def sync(self) -> Optional[LivePulseSnapshot]:
+        """Load the snapshots another process published to the shared store since the last sync"""
+        head = self.store.head()
+        if head is None:
+            return self.snapshot
+        version, fetched_at = head
+        previous = self.snapshot
+        if previous is not None and version == previous.version:
+            # Nothing new, but the leader polled again
+            if fetched_at != previous.fetched_at.timestamp():
+                latest = self.store.latest()
+                self.snapshot = replace(
+                    previous,
+                    fetched_at=datetime.fromtimestamp(latest.fetched_at, timezone.utc),
+                    has_live_match=latest.has_live_match,
+                    missing=tuple(latest.missing),
+                    unavailable=latest.unavailable
+                )
+            return self.snapshot
+        if previous is not None and version < previous.version:
+            # The store was reset: start over from what it holds
+            self.differ = EventDiffer()
+            previous = None
+
+        # Replay every missed version so `since` cursors and stream pushes match the leader's.
+        # A process loading its first snapshots only builds history: its subscribers (if any)
+        # resume through replay() and the stored versions' deltas are nothing new to them
+        catching_up = previous is None
+        for stored in self.store.since(previous.version if previous is not None else -1):
+            events = tuple(PlayerEvent(**event) for event in stored.events)
+            delta = self.differ.load(stored.version, events)
+            if self.broadcaster is not None and not catching_up and delta:
+                self.broadcaster.publish(stored.version, delta.added + delta.updated, delta.removed)
+            previous = self.snapshot = LivePulseSnapshot(
+                events=events,
+                fetched_at=datetime.fromtimestamp(stored.fetched_at, timezone.utc),
+                has_live_match=stored.has_live_match,
+                version=stored.version,
+                content_hash=stored.content_hash,
+                changed_at=datetime.fromtimestamp(stored.changed_at, timezone.utc),
+                missing=tuple(stored.missing),
+                unavailable=stored.unavailable
+            )
+        self._published.set()
+        return self.snapshot
+
+    def replay(self, cursor: int) -> Tuple[int, Optional[EventDelta]]:
+        """
+        The current version and the changes since cursor, for a stream client resuming from
+        Last-Event-ID; None if the cursor is unknown here (expired, or ahead of this process).
+        """
+        version = self.differ.version
+        if cursor > version:
+            return version, None
+        return version, self.differ.since(cursor)
+
+    @property
+    def role(self) -> str:
+        return "leader" if self.leader is None or self._leading else "follower"
+
+    def _lead(self) -> bool:
+        """Whether this process should scrape: always without a leader lock, else while holding it"""
+        if self.leader is None:
+            return True
+        if not self.leader.try_acquire():
+            return False
+        if not self._leading:
+            # Just took over: continue from the shared snapshots so version numbers keep increasing
+            self._leading = True
+            self.sync()
+        return True
+
+    def is_stale(self, snapshot: LivePulseSnapshot) -> bool:
+        """Whether the snapshot missed at least one scheduled refresh (e.g. SofaScore is down)"""
+        if snapshot.unavailable:
+            return True
+        interval = self.live_interval if snapshot.has_live_match else self.idle_interval
+        age = (datetime.now(timezone.utc) - snapshot.fetched_at).total_seconds()
+        return age > 2 * max(interval, self.sync_interval)
+
+    def next_interval(self) -> float:
+        # Players cut off by the scan budget are retried soon, while their reads fill the caches
+        live = self.snapshot is not None and (self.snapshot.has_live_match or bool(self.snapshot.missing))
+        return self.scraper.schedule.poll_interval(live, self.live_interval, self.idle_interval)
+
+    async def _run(self) -> None:
+        while True:
+            leading = False
+            try:
+                leading = self._lead()
+                if leading:
+                    await self.refresh()
+                else:
+                    self.sync()
+            except asyncio.CancelledError:
+                raise
+            except SofaScoreUnavailable as e:
+                logger.warning("Live pulse refresh skipped, serving the previous snapshot: %s", e)
+            except Exception as e:
+                # Keep serving the previous snapshot; try again on the next tick
+                logger.exception("Live pulse refresh failed: %s", e)
+            await asyncio.sleep(self.next_interval() if leading else self.sync_interval)
+
+
+def create_live_pulse_poller() -> LivePulsePoller:
+    """Build the poller for LIVE_PULSE_SOURCE: scraping in this process, or merging scraper workers' results"""
+    source, interval = sofascore_scraper, None
+    if settings.live_pulse_source == "workers":
+        # Merging is cheap; re-read the workers' results every sync interval
+        source = WorkerEventSource(WorkerStore(settings.response_store_path))
+        interval = settings.live_pulse_sync_interval
+    # API workers share snapshots through the response store's SQLite file; one of them polls
+    return LivePulsePoller(
+        source,
+        live_pulse_broadcaster,
+        live_interval=interval,
+        idle_interval=interval,
+        store=SnapshotStore(settings.response_store_path) if settings.live_pulse_shared else None,
+        leader=LeaderLock(settings.live_pulse_lock_path) if settings.live_pulse_shared else None
+    )
+
+
+live_pulse_poller = create_live_pulse_poller()
@@ -1,15 +1,50 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Optional, Union
+from fastapi import FastAPI, HTTPException, Header, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from datetime import datetime, timezone
-from models import LivePulseResponse, PlayerEvent
-# from api_service import football_api
+from models import LivePulseResponse, LivePulseDelta, PlayerEvent
+from api_service import football_api
 from sofascore_scraper import sofascore_scraper
+from live_poller import live_pulse_poller
+from scraper_worker import WorkerEventSource
+from event_stream import live_pulse_broadcaster
+from metrics import REGISTRY, MetricsMiddleware, register_cache
+from roster import normalize_name
+from singleflight import SingleFlight, singleflight_stats
+from conditional import ChangeClock, cached_response, content_hash, weak_etag
+from rendered import RenderCache
+from timestamps import format_timestamp, incident_time
 from config import settings
 
+logging.basicConfig(
+    level=settings.log_level.upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Live pulse is scraped in the background; requests only read the latest snapshot
+    await live_pulse_poller.start()
+    if settings.api_mode == "rapidapi":
+        await football_api.start()
+    yield
+    await live_pulse_poller.stop()
+    await sofascore_scraper.transport.close()
+    await football_api.close()
+
+
 app = FastAPI(
     title="CanMNT 26 Live API",
     description="Backend API for tracking Canadian National Team players' live match events",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -23,8 +58,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# Request timings for /metrics, plus a Server-Timing breakdown when X-Debug-Timing is sent
+app.add_middleware(MetricsMiddleware)
+
 
 @app.get("/")
 async def root():
@@ -33,8 +72,12 @@ async def root():
         "status": "running",
         "endpoints": {
             "/api/live-pulse": "Get live player events",
+            "/api/live-pulse/stream": "Server-Sent Events stream of new player events",
             "/api/season-stats": "Get current season statistics for all players",
             "/api/season-stats?player=Jonathan David": "Get stats for specific player",
+            "/api/cache-stats": "Season stats cache hit/miss/stale counts and coalesced calls",
+            "/api/upstream-status": "SofaScore circuit breaker and rate limiter state",
+            "/metrics": "Prometheus metrics",
             "/health": "Health check"
         }
     }
@@ -45,159 +88,373 @@ async def health_check():
     return {
         "status": "healthy",
         "timestamp": datetime.now(timezone.utc).isoformat(),
-        "environment": settings.environment
+        "environment": settings.environment,
+        "sofascore": sofascore_scraper.circuit_breaker.state,
+        # Whether this worker scrapes live pulse or reads the leader's shared snapshots
+        "live_pulse": live_pulse_poller.role
+    }
+
+
+@app.get("/api/upstream-status")
+async def get_upstream_status():
+    """
+    SofaScore circuit breaker and adaptive rate limiter state.
+    While the circuit is open no upstream calls are made and the last stored responses are served.
+    With LIVE_PULSE_SOURCE=workers, also the scraper workers, their heartbeat age and shard size.
+    """
+    status = {
+        "sofascore": {
+            "circuit_breaker": sofascore_scraper.circuit_breaker.status(),
+            "rate_limiter": sofascore_scraper.rate_limiter.status()
+        }
     }
+    if isinstance(live_pulse_poller.scraper, WorkerEventSource):
+        status["scraper_workers"] = live_pulse_poller.scraper.store.workers()
+    return status
+
+
+# Concurrent /api/season-stats requests for the same player (or all players)
+season_stats_flight = SingleFlight("season_stats_endpoint")
+# When each player's (or the all-players) season stats payload last changed, for Last-Modified
+season_stats_changes = ChangeClock()
+# Serialized and compressed bodies, rendered once per data change
+season_stats_renders = RenderCache()
+live_pulse_renders = RenderCache()
+register_cache("season_stats_render", season_stats_renders)
+register_cache("live_pulse_render", live_pulse_renders)
 
 
 @app.get("/api/season-stats")
-async def get_season_stats(player: str = None):
+async def get_season_stats(request: Request, player: str = None,
+                           budget: Optional[float] = Query(None, ge=0, le=60)):
     """
     Get current season (2025/26) statistics for Canadian players from SofaScore.
     
     Query Parameters:
         - player (optional): Specific player name to fetch stats for
+        - budget (optional): seconds to wait for stats (default SEASON_STATS_BUDGET)
     
     Returns:
         - Dictionary of player stats including matches, minutes, goals, assists, rating
+        - missing: players whose stats weren't ready within the budget (they keep loading)
+        - stale: players whose stats are served past their TTL while being refreshed
+        With ETag / Last-Modified; If-None-Match or If-Modified-Since get 304 while unchanged.
+        Bodies are rendered once per change, gzip/br compressed per Accept-Encoding.
     """
     try:
-        print(f"\n📊 Fetching season stats{f' for {player}' if player else ' for all players'}...")
-        stats = await sofascore_scraper.get_player_season_stats(player)
+        logger.debug("Fetching season stats for %s", player or "all players")
+        key = normalize_name(player) if player else None
+        budget = budget if budget is not None else settings.season_stats_budget
+        # Identical concurrent requests share one computation (and its result or error)
+        result = await season_stats_flight.do(
+            (key, budget), lambda: sofascore_scraper.season_stats_within(player, budget or None)
+        )
+        stats = result.stats
         
-        return {
-            "season": "2025/26",
-            "players": stats,
-            "count": len(stats),
-            "last_updated": datetime.now(timezone.utc).isoformat()
-        }
+        # The ETag depends on the content only, so every worker (and a restarted one) gives the
+        # same stats the same ETag; last_updated is when this process first saw them
+        digest = content_hash({"players": stats, "missing": result.missing, "stale": result.stale})
+        changed_at = season_stats_changes.observe(key, digest)
+        etag = weak_etag(digest)
+        return cached_response(
+            request,
+            lambda: season_stats_renders.get((key, etag, changed_at), lambda: {
+                "season": "2025/26",
+                "players": stats,
+                "count": len(stats),
+                "missing": result.missing,
+                "stale": result.stale,
+                "last_updated": changed_at.isoformat()
+            }),
+            etag=etag,
+            last_modified=changed_at,
+            # A partial answer fills in on the next request; don't let caches hold on to it
+            max_age=0 if result.missing else settings.season_stats_max_age
+        )
     except Exception as e:
-        print(f"❌ Error in get_season_stats: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in get_season_stats: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/live-pulse", response_model=LivePulseResponse)
-async def get_live_pulse():
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus text-format metrics: upstream latency/status, cache hit ratios, refresh durations, in-flight gauges"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/cache-stats")
+async def get_cache_stats():
+    """Season stats cache hit/miss/stale counts, coalesced calls, and pre-rendered body reuse"""
+    return {
+        "season_stats": sofascore_scraper.season_stats_cache.stats(),
+        "singleflight": singleflight_stats(),
+        "rendered": {"live_pulse": live_pulse_renders.stats(), "season_stats": season_stats_renders.stats()}
+    }
+
+
+@app.get("/api/live-pulse", response_model=Union[LivePulseDelta, LivePulseResponse])
+async def get_live_pulse(
+    request: Request,
+    since: Optional[int] = None,
+    limit: int = Query(8, ge=1, le=100),
+    player: Optional[str] = None,
+    before: Optional[str] = None,
+    budget: Optional[float] = Query(None, ge=0, le=60)
+):
     """
-    Get recent events for tracked Canadian national team players.
+    Get recent events for tracked Canadian national team players, newest first.
+    
+    Served from the background poller's latest snapshot; no scraping happens per request.
+    
+    Query Parameters:
+        - since (optional): cursor from a previous response; returns only the delta since then
+        - limit (optional): max events to return (default 8)
+        - player (optional): only this player's events
+        - before (optional): event ID from a previous page (`next_before`); returns the events after it
+        - budget (optional): seconds to wait for a first snapshot (default LIVE_PULSE_BUDGET)
     
     Returns:
         - events: List of recent player events (goals, assists, cards, etc.)
-        - last_updated: Timestamp of when the data was fetched
+        - last_updated: When the events last changed (a stale flag marks a missed refresh)
+        - cursor: Pass back as `since` on the next request
+        - next_before: Pass back as `before` for the next page, or null on the last page
+        - missing: tracked players whose events may be incomplete (the scan ran out of time for them)
+        - stale: true when the snapshot missed its refresh, or none was ready within the budget
+        With `since`: added / updated / removed (event IDs) instead of events.
+        An unknown or expired cursor returns the full response.
+        With ETag / Last-Modified; If-None-Match gets 304 until the events change.
+        Bodies are rendered once per snapshot and query, gzip/br compressed per Accept-Encoding.
     """
+    budget = budget if budget is not None else settings.live_pulse_budget
     try:
-        # Fetch events from SofaScore
-        events = await sofascore_scraper.get_canadian_player_events()
-        
-        # If no events found, use mock data for demonstration
-        if not events:
-            print("No live events found, using mock data")
-            events = get_mock_events()
-        
-        return LivePulseResponse(
-            events=events,
-            last_updated=datetime.now(timezone.utc).isoformat()
+        # Only the first snapshot is ever waited for; after that the latest one is served at once
+        snapshot = await asyncio.wait_for(live_pulse_poller.get_snapshot(), budget or None)
+        stale = live_pulse_poller.is_stale(snapshot)
+        missing = filter_missing(snapshot.missing, player)
+        # The snapshot's content hash plus the query identify the payload, so polls that found
+        # nothing new revalidate with a 304
+        etag = weak_etag(snapshot.content_hash, snapshot.version, since, limit,
+                         normalize_name(player) if player else None, before, missing, stale)
+        # Rendered once per payload: the body holds nothing that changes on a poll that found nothing new
+        return cached_response(
+            request,
+            lambda: live_pulse_renders.get(
+                etag, lambda: live_pulse_payload(snapshot, since, limit, player, before, missing, stale)
+            ),
+            etag, snapshot.changed_at, settings.live_pulse_max_age
         )
+    except asyncio.TimeoutError:
+        logger.info("No live pulse snapshot within %.1fs, serving placeholder events", budget)
     except Exception as e:
-        print(f"Error in get_live_pulse: {e}")
-        import traceback
-        traceback.print_exc()
-        # Return mock data on error
+        logger.exception("Error in get_live_pulse: %s", e)
+    # Serve the last good snapshot; mock data only if there has never been one
+    snapshot = live_pulse_poller.snapshot
+    if snapshot is not None:
+        page, next_before = page_events(list(snapshot.events), limit, player, before)
         return LivePulseResponse(
-            events=get_mock_events(),
-            last_updated=datetime.now(timezone.utc).isoformat()
+            events=page,
+            last_updated=snapshot.changed_at.isoformat(),
+            cursor=snapshot.version,
+            next_before=next_before,
+            missing=filter_missing(snapshot.missing, player),
+            stale=True
         )
+    page, next_before = page_events(get_mock_events(), limit, player, before)
+    return LivePulseResponse(
+        events=page,
+        last_updated=datetime.now(timezone.utc).isoformat(),
+        next_before=next_before,
+        stale=True
+    )
+
+
+def live_pulse_payload(snapshot, since: Optional[int], limit: int, player: Optional[str],
+                       before: Optional[str], missing: list[str] = None,
+                       stale: bool = False) -> Union[LivePulseDelta, LivePulseResponse]:
+    """The /api/live-pulse body for one snapshot and query"""
+    if since is not None:
+        delta = live_pulse_poller.differ.since(since)
+        if delta is not None:
+            # Removed IDs aren't filtered by player: the client just drops any it holds
+            return LivePulseDelta(
+                added=filter_player_events(delta.added, player),
+                updated=filter_player_events(delta.updated, player),
+                removed=list(delta.removed),
+                last_updated=snapshot.changed_at.isoformat(),
+                cursor=snapshot.version,
+                missing=missing or [],
+                stale=stale
+            )
+    
+    events = list(snapshot.events)
+    
+    # If no events found, use mock data for demonstration; but not when SofaScore is down,
+    # where placeholder events would pass for live data
+    if not events and not snapshot.unavailable:
+        events = get_mock_events()
+    
+    page, next_before = page_events(events, limit, player, before)
+    return LivePulseResponse(
+        events=page,
+        last_updated=snapshot.changed_at.isoformat(),
+        cursor=snapshot.version,
+        next_before=next_before,
+        missing=missing or [],
+        stale=stale
+    )
+
+
+def filter_missing(missing, player: Optional[str]) -> list[str]:
+    """Missing players relevant to a query: all of them, or just the requested player"""
+    if not player:
+        return list(missing)
+    player = normalize_name(player)
+    return [name for name in missing if normalize_name(name) == player]
+
+
+def filter_player_events(events, player: Optional[str]) -> list[PlayerEvent]:
+    """Events of one player (name matched ignoring accents and case), or all of them"""
+    if not player:
+        return list(events)
+    player = normalize_name(player)
+    return [event for event in events if normalize_name(event.player) == player]
+
+
+def page_events(events: list[PlayerEvent], limit: int, player: Optional[str] = None,
+                before: Optional[str] = None) -> tuple[list[PlayerEvent], Optional[str]]:
+    """
+    One page of newest-first events: filtered by player, starting after the event `before`.
+    Returns the page and the `before` cursor for the next page (None when there is none).
+    An unknown `before` (the event aged out of the snapshot) returns an empty page.
+    """
+    events = filter_player_events(events, player)
+    if before is not None:
+        ids = [event.id for event in events]
+        events = events[ids.index(before) + 1:] if before in ids else []
+    page = events[:limit]
+    return page, (page[-1].id if len(events) > limit else None)
+
+
+@app.get("/api/live-pulse/stream")
+async def stream_live_pulse(
+    last_event_id: Optional[int] = None,
+    last_event_id_header: Optional[int] = Header(None, alias="Last-Event-ID")
+):
+    """
+    Server-Sent Events stream of new or changed player events, pushed as the poller detects them.
+    
+    Message IDs are snapshot versions (the /api/live-pulse `cursor`), the same on every worker.
+    Reconnecting clients resume from the Last-Event-ID header (sent automatically by EventSource)
+    or the last_event_id query parameter, on any worker. A `reset` event means the cursor is no
+    longer available and the client should refetch /api/live-pulse.
+    """
+    resume_from = last_event_id_header if last_event_id_header is not None else last_event_id
+    return StreamingResponse(
+        live_pulse_broadcaster.stream(resume_from, live_pulse_poller.replay),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# Mock events are dated relative to server start, so their payload doesn't change between requests
+MOCK_NOW = int(time.time())
+
+
+def mock_times(minutes_ago: int, minute: int, added_time: int = 0) -> dict:
+    """timestamp / kickoff_at / occurred_at of a mock incident that happened minutes_ago before server start"""
+    occurred_at = MOCK_NOW - minutes_ago * 60
+    kickoff_at = occurred_at - (incident_time(0, minute, added_time) or 0)
+    return {"timestamp": format_timestamp(occurred_at), "kickoff_at": kickoff_at, "occurred_at": occurred_at}
 
 
 def get_mock_events() -> list[PlayerEvent]:
     """Mock events for development/testing when no live matches"""
     return [
         PlayerEvent(
-            id=1,
+            id="mock-1",
             player="Alphonso Davies",
             event="Goal",
             type="goal",
             context="Bayern Munich 3-1 Borussia Dortmund",
             minute="67'",
-            timestamp="2 minutes ago",
+            **mock_times(2, 67),
             league="Bundesliga",
             team="Bayern Munich"
         ),
         PlayerEvent(
-            id=2,
+            id="mock-2",
             player="Jonathan David",
             event="Assist",
             type="assist",
             context="Lille 2-0 Lyon",
             minute="54'",
-            timestamp="18 minutes ago",
+            **mock_times(18, 54),
             league="Ligue 1",
             team="LOSC Lille"
         ),
         PlayerEvent(
-            id=3,
+            id="mock-3",
             player="Tajon Buchanan",
             event="Goal",
             type="goal",
             context="Inter Milan 1-0 Napoli",
             minute="23'",
-            timestamp="1 hour ago",
+            **mock_times(60, 23),
             league="Serie A",
             team="Inter Milan"
         ),
         PlayerEvent(
-            id=4,
+            id="mock-4",
             player="Stephen Eustáquio",
             event="Yellow Card",
             type="card",
             context="Porto 1-1 Benfica",
             minute="78'",
-            timestamp="3 hours ago",
+            **mock_times(180, 78),
             league="Primeira Liga",
             team="FC Porto"
         ),
         PlayerEvent(
-            id=5,
+            id="mock-5",
             player="Cyle Larin",
             event="Goal",
             type="goal",
             context="Real Valladolid 2-1 Real Betis",
             minute="89'",
-            timestamp="5 hours ago",
+            **mock_times(300, 89),
             league="La Liga",
             team="Real Valladolid"
         ),
         PlayerEvent(
-            id=6,
+            id="mock-6",
             player="Alphonso Davies",
             event="Assist",
             type="assist",
             context="Bayern Munich 2-0 RB Leipzig",
             minute="34'",
-            timestamp="8 hours ago",
+            **mock_times(480, 34),
             league="Bundesliga",
             team="Bayern Munich"
         ),
         PlayerEvent(
-            id=7,
+            id="mock-7",
             player="Kamal Miller",
             event="Yellow Card",
             type="card",
             context="CF Montréal 1-1 Atlanta United",
             minute="82'",
-            timestamp="12 hours ago",
+            **mock_times(720, 82),
             league="MLS",
             team="CF Montréal"
         ),
         PlayerEvent(
-            id=8,
+            id="mock-8",
             player="Jonathan David",
             event="Goal",
             type="goal",
             context="Lille 3-2 Marseille",
             minute="90+2'",
-            timestamp="1 day ago",
+            **mock_times(1440, 90, 2),
             league="Ligue 1",
             team="LOSC Lille"
         ),
@@ -0,0 +1,297 @@
+import contextvars
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Latency buckets (seconds) covering cache hits through slow upstream calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.register(self)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {v}" for k, v in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    """Settable gauge, or one read from a callback at scrape time"""
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 callback: Callable[[], Dict[Tuple[str, ...], float]] = None):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._callback = callback
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    @contextmanager
+    def track_inprogress(self, *labels: str) -> Iterator[None]:
+        self.inc(*labels)
+        try:
+            yield
+        finally:
+            self.dec(*labels)
+
+    def _samples(self) -> List[str]:
+        values = self._callback() if self._callback else self._values
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {v}" for k, v in sorted(values.items())]
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+            row[-2] += 1
+            row[-1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for labels, row in sorted(self._values.items()):
+            for bound, count in zip(self.buckets, row):
+                bucket_labels = _format_labels(self.labelnames, labels, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{bucket_labels} {count}")
+            inf_labels = _format_labels(self.labelnames, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf_labels} {row[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {row[-2]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {row[-1]}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> None:
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+# Per-request timing breakdown, filled in only when a request asks for it (X-Debug-Timing)
+request_timing: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar("request_timing", default=None)
+
+
+def record_timing(phase: str, seconds: float) -> None:
+    timing = request_timing.get()
+    if timing is not None:
+        timing[phase] = timing.get(phase, 0.0) + seconds
+        timing[f"{phase}_count"] = timing.get(f"{phase}_count", 0) + 1
+
+
+def server_timing_header(timing: Dict[str, float], total: float) -> str:
+    """Render a Server-Timing header value (durations in ms)"""
+    parts = [
+        f'{phase};dur={seconds * 1000:.1f};desc="{int(timing.get(f"{phase}_count", 0))} calls"'
+        for phase, seconds in timing.items() if not phase.endswith("_count")
+    ]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+_ID_SEGMENT = re.compile(r"/\d+")
+
+
+def endpoint_label(path: str) -> str:
+    """Collapse IDs so upstream paths group by endpoint: /player/123/events/last/0 -> /player/{id}/events/last/{id}"""
+    return _ID_SEGMENT.sub("/{id}", path)
+
+
+# Upstream (SofaScore) calls
+UPSTREAM_LATENCY = Histogram(
+    "sofascore_upstream_latency_seconds", "SofaScore request latency by endpoint", ["endpoint"]
+)
+UPSTREAM_RESPONSES = Counter(
+    "sofascore_upstream_responses_total", "SofaScore responses by endpoint and status code", ["endpoint", "status"]
+)
+UPSTREAM_INFLIGHT = Gauge(
+    "sofascore_upstream_inflight", "SofaScore requests currently in flight"
+)
+FETCH_QUEUE_WAIT = Histogram(
+    "sofascore_fetch_queue_seconds", "Time waiting for the fetch engine (concurrency slot and rate budget)"
+)
+TRANSPORT_QUEUE_WAIT = Histogram(
+    "sofascore_transport_queue_seconds", "Time a request waited for a transport executor thread"
+)
+JSON_PARSE = Histogram(
+    "sofascore_json_parse_seconds", "Time spent decoding SofaScore JSON bodies", ["endpoint"]
+)
+RESPONSE_STORE_LOOKUPS = Counter(
+    "response_store_lookups_total", "Persistent response store lookups by result (hit, miss)", ["result"]
+)
+
+# Throttling and outages
+UPSTREAM_RETRIES = Counter(
+    "sofascore_retries_total", "SofaScore requests retried after a throttle or failure", ["endpoint", "reason"]
+)
+CIRCUIT_STATE = Gauge(
+    "circuit_breaker_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)", ["upstream"]
+)
+STALE_SERVED = Counter(
+    "response_store_stale_served_total", "Stored responses served past their TTL because the upstream failed"
+)
+
+# Request coalescing: calls that ran vs. joined an identical call already in flight
+SINGLEFLIGHT_CALLS = Counter(
+    "singleflight_calls_total", "Single-flight calls by group and outcome (executed, collapsed)", ["group", "outcome"]
+)
+
+# Refresh cycles
+REFRESH_DURATION = Histogram(
+    "refresh_duration_seconds", "Duration of background and cache refreshes", ["job"]
+)
+
+# API handlers
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "API request duration by route and status code", ["route", "status"]
+)
+HTTP_INFLIGHT = Gauge(
+    "http_requests_inflight", "API requests currently being handled"
+)
+
+# In-memory caches, read at scrape time from each cache's stats()
+_caches: Dict[str, Any] = {}
+
+
+def register_cache(name: str, cache: Any) -> None:
+    _caches[name] = cache
+
+
+def _cache_stat(*keys: str) -> Callable[[], Dict[Tuple[str, ...], float]]:
+    def collect() -> Dict[Tuple[str, ...], float]:
+        values = {}
+        for name, cache in _caches.items():
+            stats = cache.stats()
+            for key in keys:
+                values[(name, key) if len(keys) > 1 else (name,)] = stats[key]
+        return values
+    return collect
+
+
+CACHE_LOOKUPS = Gauge(
+    "cache_lookups", "Cache lookups by result since start", ["cache", "result"],
+    callback=_cache_stat("hits", "misses", "stale")
+)
+CACHE_HIT_RATIO = Gauge(
+    "cache_hit_ratio", "Share of lookups answered from cache (fresh or stale)", ["cache"],
+    callback=_cache_stat("hit_ratio")
+)
+CACHE_ENTRIES = Gauge(
+    "cache_entries", "Entries currently held", ["cache"],
+    callback=_cache_stat("size")
+)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware: request duration by route and status, in-flight gauge, and a
+    Server-Timing breakdown (queue, upstream, parse) when the request sends X-Debug-Timing.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        debug = any(name == b"x-debug-timing" for name, _ in scope.get("headers", []))
+        timing: Optional[Dict[str, float]] = {} if debug else None
+        token = request_timing.set(timing)
+        start = time.perf_counter()
+        status = "500"
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+                if timing is not None:
+                    header = server_timing_header(timing, time.perf_counter() - start)
+                    message = {**message, "headers": [*message.get("headers", []), (b"server-timing", header.encode())]}
+            await send(message)
+
+        try:
+            with HTTP_INFLIGHT.track_inprogress():
+                await self.app(scope, receive, send_with_timing)
+        finally:
+            request_timing.reset(token)
+            # The router stores the matched route in the scope; unmatched paths share one label
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start, getattr(route, "path", "unmatched"), status
+            )
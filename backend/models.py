@@ -3,17 +3,41 @@ from typing import Literal, Optional
 
 
 class PlayerEvent(BaseModel):
-    id: int
+    # Stable across polls: "{sofascore event id}-{incident key}-{player id}-{type}"
+    id: str
     player: str
     event: str
     type: Literal["goal", "assist", "card", "substitution"]
     context: str
     minute: str
+    # Legacy text: the incident time as UTC ISO 8601 (see timestamps.format_timestamp)
     timestamp: str
     league: str
     team: Optional[str] = None
+    # Epoch seconds of the match kickoff and (approximately, from the match clock) of the incident;
+    # clients render "N minutes ago" from these
+    kickoff_at: Optional[int] = None
+    occurred_at: Optional[int] = None
 
 
 class LivePulseResponse(BaseModel):
     events: list[PlayerEvent]
     last_updated: str
+    # Pass back as ?since= to receive only what changed
+    cursor: int = 0
+    # Pass back as ?before= for the next (older) page; None on the last page
+    next_before: Optional[str] = None
+    # Tracked players whose events may be incomplete (not read within the scan budget)
+    missing: list[str] = []
+    # The snapshot missed its refresh (SofaScore down or slow) or isn't ready yet
+    stale: bool = False
+
+
+class LivePulseDelta(BaseModel):
+    added: list[PlayerEvent]
+    updated: list[PlayerEvent]
+    removed: list[str]
+    last_updated: str
+    cursor: int
+    missing: list[str] = []
+    stale: bool = False
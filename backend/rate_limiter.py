@@ -0,0 +1,100 @@
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None"""
+    value = next((v for k, v in headers.items() if k.lower() == "retry-after"), None)
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    Async token bucket used to keep upstream calls under a requests-per-second budget.
+    Shared by every coroutine that talks to the same upstream, so the budget is global
+    rather than per player or per endpoint.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        # rate <= 0 disables limiting entirely
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def defer(self, seconds: float) -> None:
+        """Hold back every caller for the next `seconds` (e.g. the upstream reported its quota is used up)"""
+        if self.rate <= 0:
+            return
+        self._refill()
+        self._tokens = min(self._tokens, -seconds * self.rate)
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent"""
+        if self.rate <= 0:
+            return
+
+        # Holding the lock while sleeping keeps waiters in FIFO order
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """
+    Token bucket whose rate adapts to upstream pushback (AIMD): every throttled response
+    (429/403) halves the rate down to min_rate and holds callers back for Retry-After;
+    every success adds `increase` requests/second back, up to the configured max_rate.
+    """
+
+    def __init__(self, max_rate: float, min_rate: float = 0.5, increase: float = 0.1,
+                 decrease: float = 0.5, burst: Optional[int] = None):
+        super().__init__(max_rate, burst)
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.throttled = 0
+
+    def on_success(self) -> None:
+        if self.rate <= 0 or self.rate >= self.max_rate:
+            return
+        self._refill()
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        self.throttled += 1
+        if self.rate <= 0:
+            return
+        self._refill()
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        if retry_after:
+            self.defer(retry_after)
+
+    def status(self) -> dict:
+        return {
+            "rate": round(self.rate, 3),
+            "max_rate": self.max_rate,
+            "min_rate": self.min_rate,
+            "throttled": self.throttled,
+        }
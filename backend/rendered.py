@@ -0,0 +1,112 @@
+import gzip
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Below this size compression saves less than its headers cost
+MIN_COMPRESS_SIZE = 512
+
+
+def dumps(content: Any, sort_keys: bool = False) -> bytes:
+    """Compact UTF-8 JSON, with orjson when installed"""
+    if isinstance(content, BaseModel):
+        content = content.model_dump(mode="json")
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(content, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> Dict[str, float]:
+    """{coding: q} from an Accept-Encoding header; "*" stands for any coding not listed"""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+@dataclass(frozen=True)
+class RenderedBody:
+    """A JSON payload serialized once, with its gzip and (if brotli is installed) br variants"""
+    identity: bytes
+    gzip: Optional[bytes] = None
+    br: Optional[bytes] = None
+
+    @classmethod
+    def render(cls, content: Any) -> "RenderedBody":
+        body = dumps(content)
+        if len(body) < MIN_COMPRESS_SIZE:
+            return cls(body)
+        return cls(
+            body,
+            gzip=gzip.compress(body, compresslevel=9, mtime=0),
+            br=brotli.compress(body, quality=11) if brotli is not None else None
+        )
+
+    def negotiate(self, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        """The smallest variant the client accepts, and its Content-Encoding (None for identity)"""
+        accepted = accepted_encodings(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        for coding, body in (("br", self.br), ("gzip", self.gzip)):
+            if body is not None and accepted.get(coding, wildcard) > 0:
+                return body, coding
+        return self.identity, None
+
+
+class RenderCache:
+    """
+    Rendered bodies by key (an ETag, plus anything else the body depends on), so each payload
+    is serialized and compressed once per data change rather than on every request.
+    LRU-bounded, since keys also vary with query parameters.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, RenderedBody]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> RenderedBody:
+        rendered = self._entries.get(key)
+        if rendered is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return rendered
+        self.misses += 1
+        rendered = self._entries[key] = RenderedBody.render(build())
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return rendered
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": 0,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "size": len(self._entries),
+            "max_entries": self.max_entries
+        }
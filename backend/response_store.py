@@ -0,0 +1,74 @@
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    body: Any
+    fetched_at: float
+    # Fetched once the upstream body could no longer change (e.g. a finished match's incidents)
+    final: bool = False
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class ResponseStore:
+    """
+    Persistent store of raw upstream JSON bodies keyed by URL path, backed by SQLite.
+    Survives restarts and --reload, so a new process starts with warm data.
+    Freshness is decided by the caller at read time (see SofaScoreScraper._get_json).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " path TEXT PRIMARY KEY,"
+            " body TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " final INTEGER NOT NULL DEFAULT 0)"
+        )
+
+    def get(self, path: str) -> Optional[StoredResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, fetched_at, final FROM responses WHERE path = ?", (path,)
+            ).fetchone()
+        if row is None:
+            return None
+        return StoredResponse(body=json.loads(row[0]), fetched_at=row[1], final=bool(row[2]))
+
+    def put(self, path: str, body: Any, fetched_at: float = None, final: bool = False) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (path, body, fetched_at, final) VALUES (?, ?, ?, ?)",
+                (path, json.dumps(body, separators=(",", ":")), fetched_at or time.time(), int(final))
+            )
+
+    def items(self) -> Dict[str, StoredResponse]:
+        """Every stored response by path"""
+        with self._lock:
+            rows = self._conn.execute("SELECT path, body, fetched_at, final FROM responses ORDER BY path").fetchall()
+        return {
+            path: StoredResponse(body=json.loads(body), fetched_at=fetched_at, final=bool(final))
+            for path, body, fetched_at, final in rows
+        }
+
+    def delete(self, path: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE path = ?", (path,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,135 @@
+import json
+import logging
+import os
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Provider keys used in each player's "ids"
+API_FOOTBALL = "api_football"
+SOFASCORE = "sofascore"
+
+
+def normalize_name(name: str) -> str:
+    """Accent- and case-insensitive name for matching ("Ismaël Koné" == "ismael kone")"""
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    return " ".join("".join(c for c in decomposed if not unicodedata.combining(c)).casefold().split())
+
+
+@dataclass(frozen=True)
+class Player:
+    name: str
+    position: Optional[str] = None
+    # Club name and API-Football team ID
+    team: Optional[str] = None
+    team_id: Optional[int] = None
+    # Player ID per provider, e.g. {"api_football": 163474, "sofascore": 935564}
+    ids: Dict[str, int] = field(default_factory=dict)
+
+
+class Roster:
+    """
+    Immutable set of tracked players with lookup indexes built once per load:
+    by provider ID, by normalized name, and the ID set per provider for membership tests.
+    """
+
+    def __init__(self, players: Iterable[Player], version: int = 0):
+        self.players: List[Player] = list(players)
+        self.version = version
+        self._by_name: Dict[str, Player] = {normalize_name(p.name): p for p in self.players}
+        self._by_id: Dict[str, Dict[int, Player]] = {}
+        for player in self.players:
+            for provider, player_id in player.ids.items():
+                self._by_id.setdefault(provider, {})[player_id] = player
+        self._ids: Dict[str, FrozenSet[int]] = {
+            provider: frozenset(index) for provider, index in self._by_id.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    def get(self, name: str) -> Optional[Player]:
+        """Player by name, ignoring accents, case and extra whitespace"""
+        return self._by_name.get(normalize_name(name))
+
+    def by_id(self, provider: str, player_id: int) -> Optional[Player]:
+        return self._by_id.get(provider, {}).get(player_id)
+
+    def ids(self, provider: str) -> FrozenSet[int]:
+        """Every tracked player ID for a provider"""
+        return self._ids.get(provider, frozenset())
+
+    def provider_ids(self, provider: str) -> Dict[str, int]:
+        """{player name: provider ID} for players known to that provider, in roster order"""
+        return {p.name: p.ids[provider] for p in self.players if provider in p.ids}
+
+
+def parse_roster(data: dict, version: int = 0) -> Roster:
+    players = []
+    for entry in data.get("players", []):
+        players.append(Player(
+            name=entry["name"],
+            position=entry.get("position"),
+            team=entry.get("team"),
+            team_id=entry.get("team_id"),
+            ids={provider: int(player_id) for provider, player_id in (entry.get("ids") or {}).items()
+                 if player_id is not None}
+        ))
+    return Roster(players, version)
+
+
+class RosterRegistry:
+    """
+    The tracked roster, loaded from a JSON file and reloaded when the file changes.
+    `current` checks the file's mtime at most every `check_interval` seconds; a file that
+    fails to parse is logged and the previous roster stays in use.
+    """
+
+    def __init__(self, path: str, check_interval: float = 5.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._checked = 0.0
+        self._roster = Roster([])
+        self.reload()
+
+    @property
+    def current(self) -> Roster:
+        if time.monotonic() - self._checked >= self.check_interval:
+            self._checked = time.monotonic()
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except OSError:
+                mtime = None
+            if mtime != self._mtime:
+                self.reload()
+        return self._roster
+
+    def reload(self) -> Roster:
+        with self._lock:
+            try:
+                # Recorded even if parsing fails, so a broken file is reported once per edit
+                self._mtime = os.stat(self.path).st_mtime
+                with open(self.path, encoding="utf-8") as f:
+                    roster = parse_roster(json.load(f), self._roster.version + 1)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.error("Could not load roster from %s, keeping %d players: %s", self.path, len(self._roster), e)
+                return self._roster
+            self._checked = time.monotonic()
+            self._roster = roster
+            logger.info("Roster loaded from %s: %d players (version %d)", self.path, len(roster), roster.version)
+            return roster
+
+
+# A relative roster path is relative to the backend directory, wherever the app is started from
+roster_registry = RosterRegistry(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), settings.roster_path),
+    settings.roster_check_interval
+)
@@ -0,0 +1,74 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+
+@dataclass(frozen=True)
+class ScheduledMatch:
+    event_id: int
+    start: int
+    status: str
+
+
+class ScheduleIndex:
+    """
+    Known matches per event-list source (a club or a player), built from SofaScore's
+    events/last and events/next lists. A source is active while one of its matches is in
+    progress or kicked off less than `active_window` seconds ago; only active sources need
+    their lists re-read on every poll, the rest are refreshed rarely.
+    """
+
+    def __init__(self, active_window: float):
+        self.active_window = active_window
+        self._matches: Dict[str, Dict[int, ScheduledMatch]] = {}
+
+    def __contains__(self, source: str) -> bool:
+        return source in self._matches
+
+    def update(self, source: str, events: Iterable[dict]) -> None:
+        """Replace what is known about one source with the matches in its lists"""
+        self._matches[source] = {
+            event["id"]: ScheduledMatch(
+                event_id=event["id"],
+                start=event.get("startTimestamp", 0),
+                status=event.get("status", {}).get("type", "")
+            )
+            for event in events if event.get("id")
+        }
+
+    def forget(self, keep: Iterable[str]) -> None:
+        """Drop sources no longer scanned (e.g. a player left the roster or changed clubs)"""
+        keep = set(keep)
+        for source in list(self._matches):
+            if source not in keep:
+                del self._matches[source]
+
+    def is_active(self, source: str, now: float = None) -> bool:
+        now = now if now is not None else time.time()
+        return any(
+            match.status == "inprogress"
+            or (match.status != "finished" and match.start <= now < match.start + self.active_window)
+            for match in self._matches.get(source, {}).values()
+        )
+
+    def seconds_until_kickoff(self, now: float = None) -> Optional[float]:
+        """Seconds until the next known kickoff of any source, or None if none is scheduled"""
+        now = now if now is not None else time.time()
+        upcoming = [
+            match.start for matches in self._matches.values() for match in matches.values()
+            if match.status == "notstarted" and match.start > now
+        ]
+        return min(upcoming) - now if upcoming else None
+
+    def any_active(self, now: float = None) -> bool:
+        return any(self.is_active(source, now) for source in self._matches)
+
+    def poll_interval(self, live: bool, live_interval: float, idle_interval: float) -> float:
+        """Seconds until the next poll: live_interval while a match is on, else up to the next kickoff"""
+        if live or self.any_active():
+            return live_interval
+        # Wake up for the next known kickoff rather than up to idle_interval after it
+        until_kickoff = self.seconds_until_kickoff()
+        if until_kickoff is not None:
+            return max(1.0, min(idle_interval, until_kickoff))
+        return idle_interval
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Standalone live-pulse scraper worker, so scraping (requests, JSON parsing, building events)
+runs outside the API process. Start one or more next to the API and set
+LIVE_PULSE_SOURCE=workers there; the API then only merges their published results.
+
+Run from the backend directory:
+    python scraper_worker.py                  # worker ID defaults to <host>-<pid>
+    python scraper_worker.py --worker-id w1
+
+Workers split the tracked players by consistent hashing on SofaScore player ID (see
+shard_coordinator.py); when one stops heartbeating its players move to the others.
+"""
+import argparse
+import asyncio
+import heapq
+import logging
+import os
+import signal
+import socket
+import time
+from dataclasses import replace
+from typing import Dict, List
+
+from config import settings
+from models import PlayerEvent
+from roster import SOFASCORE, RosterRegistry, roster_registry
+from schedule_index import ScheduleIndex
+from shard_coordinator import ShardCoordinator
+from sofascore_scraper import SofaScoreScraper, SofaScoreUnavailable, sofascore_scraper
+from worker_store import WorkerResult, WorkerStore
+
+logger = logging.getLogger(__name__)
+
+
+class ScraperWorker:
+    """
+    Scans this worker's shard of the roster on the live-pulse schedule and publishes the
+    result to the worker store. Heartbeats run on their own task so a long scan never makes
+    the worker look dead; between scans the shard is re-checked every heartbeat, and a change
+    (a worker joined or died, the roster was edited) triggers a scan at once.
+    """
+
+    def __init__(self, scraper: SofaScoreScraper, store: WorkerStore, worker_id: str,
+                 heartbeat_interval: float = None, heartbeat_timeout: float = None):
+        self.scraper = scraper
+        self.store = store
+        self.worker_id = worker_id
+        self.heartbeat_interval = heartbeat_interval or settings.scraper_worker_heartbeat_interval
+        self.coordinator = ShardCoordinator(store, worker_id, heartbeat_timeout or settings.scraper_worker_timeout)
+        self.players: Dict[str, int] = {}
+
+    def heartbeat(self) -> None:
+        self.store.heartbeat(self.worker_id, os.getpid(), len(self.players))
+
+    def shard(self) -> Dict[str, int]:
+        return self.coordinator.assign(self.scraper.roster.current.provider_ids(SOFASCORE))
+
+    async def run_once(self) -> WorkerResult:
+        """Scan this worker's shard and publish the result"""
+        self.players = self.shard()
+        start = time.perf_counter()
+        keyed_events = await self.scraper.scan_player_events(player_ids=self.players)
+        result = WorkerResult(
+            worker_id=self.worker_id,
+            events=[(list(key), event.model_dump()) for key, event in keyed_events],
+            live_event_ids=sorted(self.scraper.live_event_ids),
+            fetched_at=time.time(),
+            cycle_seconds=time.perf_counter() - start,
+            missing=self.scraper.missing_players,
+            players=sorted(self.players)
+        )
+        self.store.publish(result)
+        logger.info(
+            "Worker %s: %d events for %d players in %.2fs",
+            self.worker_id, len(result.events), len(self.players), result.cycle_seconds
+        )
+        return result
+
+    async def run(self) -> None:
+        heartbeats = asyncio.create_task(self._heartbeats())
+        try:
+            while True:
+                try:
+                    await self.run_once()
+                except SofaScoreUnavailable as e:
+                    logger.warning("Worker %s scan skipped, keeping its previous result: %s", self.worker_id, e)
+                except Exception as e:
+                    logger.exception("Worker %s scan failed: %s", self.worker_id, e)
+                await self._wait(self.scraper.schedule.poll_interval(
+                    bool(self.scraper.live_event_ids),
+                    settings.live_pulse_live_interval,
+                    settings.live_pulse_idle_interval
+                ))
+        finally:
+            heartbeats.cancel()
+            self.store.remove(self.worker_id)
+
+    async def _heartbeats(self) -> None:
+        while True:
+            self.heartbeat()
+            await asyncio.sleep(self.heartbeat_interval)
+
+    async def _wait(self, interval: float) -> None:
+        """Sleep until the next scan is due, or until this worker's shard changes"""
+        deadline = time.monotonic() + interval
+        while (remaining := deadline - time.monotonic()) > 0:
+            await asyncio.sleep(min(remaining, self.heartbeat_interval))
+            if self.shard() != self.players:
+                logger.info("Worker %s shard changed, rescanning", self.worker_id)
+                return
+
+
+class WorkerEventSource:
+    """
+    Live-pulse events merged from the scraper workers' latest results, with the scraper's
+    interface (get_canadian_player_events, live_event_ids, schedule) so LivePulsePoller in the
+    API can poll it instead of scraping. A worker that stopped or died leaves its last result
+    behind: its events for players no live worker has scanned yet keep being served (those
+    players are reported missing) until the survivors' results cover them, so the events
+    don't drop out of the live pulse and come back a cycle later.
+    """
+
+    def __init__(self, store: WorkerStore, heartbeat_timeout: float = None, roster: RosterRegistry = None):
+        self.store = store
+        self.heartbeat_timeout = heartbeat_timeout or settings.scraper_worker_timeout
+        self.roster = roster or roster_registry
+        self.live_event_ids = set()
+        self.missing_players: List[str] = []
+        # The workers follow the match schedule; the API just re-reads their results
+        self.schedule = ScheduleIndex(0)
+
+    async def get_canadian_player_events(self, limit: int = None) -> List[PlayerEvent]:
+        results = self.store.results(self.heartbeat_timeout)
+        live = [result for result in results if not result.stale]
+        if not live:
+            raise SofaScoreUnavailable("No scraper worker is running")
+        covered = {name for result in live for name in result.players}
+        tracked = {player.name for player in self.roster.current.players}
+        
+        merged_results = list(live)
+        missing = {name for result in live for name in result.missing}
+        for result in results:
+            if not result.stale:
+                continue
+            orphaned = (set(result.players) & tracked) - covered
+            if not orphaned:
+                self.store.discard_result(result.worker_id, self.heartbeat_timeout)
+                continue
+            # Only the events no live worker reports yet; the survivors' copies win for the rest
+            merged_results.append(replace(
+                result, events=[(key, event) for key, event in result.events if event["player"] not in covered]
+            ))
+            missing |= orphaned
+        
+        # Teammates in different shards share a club, so the same event can come from two
+        # workers: keep the most recently fetched copy
+        merged = {}
+        for result in sorted(merged_results, key=lambda result: (not result.stale, result.fetched_at)):
+            for key, event in result.events:
+                merged[event["id"]] = (tuple(key), event)
+        self.live_event_ids = {event_id for result in live for event_id in result.live_event_ids}
+        self.missing_players = sorted(missing)
+        newest = heapq.nlargest(limit or settings.live_pulse_history_size, merged.values(), key=lambda item: item[0])
+        return [PlayerEvent(**event) for _, event in newest]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--worker-id", default=f"{socket.gethostname()}-{os.getpid()}")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=settings.log_level.upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    worker = ScraperWorker(sofascore_scraper, WorkerStore(settings.response_store_path), args.worker_id)
+
+    async def run() -> None:
+        task = asyncio.current_task()
+        # Deregister on SIGTERM too, so the other workers take over the shard at once
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, task.cancel)
+        try:
+            await worker.run()
+        finally:
+            await sofascore_scraper.transport.close()
+
+    try:
+        asyncio.run(run())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+
+if __name__ == "__main__":
+    main()
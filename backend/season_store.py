@@ -0,0 +1,104 @@
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class CompetitionStats:
+    """One player's totals in one competition season, as last fetched from statistics/overall"""
+    tournament_id: int
+    season_id: int
+    league: str
+    appearances: int
+    minutes: int
+    goals: int
+    assists: int
+    rating: float
+    # ID of the latest finished event in this tournament and season when the row was fetched
+    # (None if the recent events list was unavailable); the row is re-fetched once a newer one finishes
+    fingerprint: Optional[str]
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+def aggregate_rows(rows: Iterable[CompetitionStats]) -> Dict[str, float]:
+    """
+    Season totals across competitions. The rating is weighted by minutes played
+    (by appearances when minutes are missing), over competitions that report a rating.
+    """
+    totals = {"matches": 0, "minutes": 0, "goals": 0, "assists": 0}
+    rating_sum = rating_weight = 0.0
+
+    for row in rows:
+        if row.appearances <= 0:
+            continue
+        totals["matches"] += row.appearances
+        totals["minutes"] += row.minutes
+        totals["goals"] += row.goals
+        totals["assists"] += row.assists
+        if row.rating > 0:
+            weight = row.minutes or row.appearances
+            rating_sum += row.rating * weight
+            rating_weight += weight
+
+    totals["rating"] = rating_sum / rating_weight if rating_weight else 0.0
+    return totals
+
+
+class SeasonStatsStore:
+    """
+    Per-competition season stat rows by SofaScore player, backed by SQLite so they
+    survive restarts. Totals are recomputed from these rows; only competitions with a newer
+    finished event than the row's fingerprint are fetched again (see
+    SofaScoreScraper._fetch_player_season_stats).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS competition_stats ("
+            " player_id INTEGER NOT NULL,"
+            " tournament_id INTEGER NOT NULL,"
+            " season_id INTEGER NOT NULL,"
+            " league TEXT NOT NULL,"
+            " appearances INTEGER NOT NULL,"
+            " minutes INTEGER NOT NULL,"
+            " goals INTEGER NOT NULL,"
+            " assists INTEGER NOT NULL,"
+            " rating REAL NOT NULL,"
+            " fingerprint TEXT,"
+            " fetched_at REAL NOT NULL,"
+            " PRIMARY KEY (player_id, tournament_id, season_id))"
+        )
+
+    def rows(self, player_id: int) -> Dict[Tuple[int, int], CompetitionStats]:
+        """Every stored row for a player by (tournament id, season id)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT tournament_id, season_id, league, appearances, minutes, goals, assists,"
+                " rating, fingerprint, fetched_at FROM competition_stats WHERE player_id = ?",
+                (player_id,)
+            ).fetchall()
+        return {(row[0], row[1]): CompetitionStats(*row) for row in rows}
+
+    def put(self, player_id: int, row: CompetitionStats) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO competition_stats VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (player_id, row.tournament_id, row.season_id, row.league, row.appearances, row.minutes,
+                 row.goals, row.assists, row.rating, row.fingerprint, row.fetched_at)
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,66 @@
+import bisect
+import hashlib
+import logging
+from typing import Dict, Iterable, List
+
+from worker_store import WorkerStore
+
+logger = logging.getLogger(__name__)
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Consistent hashing of keys onto nodes, with `replicas` virtual points per node so shards
+    stay even. Adding or removing a node only moves the keys that node gains or loses.
+    """
+
+    def __init__(self, nodes: Iterable[str], replicas: int = 64):
+        self.nodes = sorted(set(nodes))
+        points = sorted((_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(replicas))
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def owner(self, key: str) -> str:
+        """The node owning key: the first virtual point clockwise from its hash"""
+        if not self._nodes:
+            raise LookupError("Hash ring has no nodes")
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._nodes[index]
+
+
+class ShardCoordinator:
+    """
+    Splits the tracked players between the live scraper workers by consistent hashing on
+    SofaScore player ID. Every worker runs its own coordinator over the shared membership
+    table, so there is no coordinator process to fail: all of them compute the same ring from
+    the same live set, and a dead worker's players move to the survivors on their next check.
+    """
+
+    def __init__(self, store: WorkerStore, worker_id: str, heartbeat_timeout: float, replicas: int = 64):
+        self.store = store
+        self.worker_id = worker_id
+        self.heartbeat_timeout = heartbeat_timeout
+        self.replicas = replicas
+        self.ring = HashRing([], replicas)
+
+    def members(self) -> List[str]:
+        members = self.store.live_workers(self.heartbeat_timeout)
+        # This worker owns a share even before its first heartbeat is visible
+        if self.worker_id not in members:
+            members = sorted(members + [self.worker_id])
+        if members != self.ring.nodes:
+            logger.info("Scraper workers changed: %s -> %s", self.ring.nodes or "none", members)
+            self.ring = HashRing(members, self.replicas)
+        return members
+
+    def assign(self, player_ids: Dict[str, int]) -> Dict[str, int]:
+        """This worker's share of {player name: SofaScore ID}"""
+        self.members()
+        return {
+            name: player_id for name, player_id in player_ids.items()
+            if self.ring.owner(str(player_id)) == self.worker_id
+        }
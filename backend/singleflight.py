@@ -0,0 +1,58 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from metrics import SINGLEFLIGHT_CALLS
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first call runs, later ones await the
+    same task and get its result or its exception. Nothing is kept once the call finishes,
+    so this only deduplicates work that is in flight (caching is the caller's concern).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.collapsed = 0
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        _groups[name] = self
+
+    def start(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """The in-flight task for key, starting fn() if there is none"""
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is not None:
+            self.collapsed += 1
+            SINGLEFLIGHT_CALLS.inc(self.name, "collapsed")
+            return task
+        SINGLEFLIGHT_CALLS.inc(self.name, "executed")
+        task = asyncio.create_task(fn())
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._done(key, t))
+        return task
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        # Mark the exception retrieved: callers that awaited the task got it already, and a
+        # task nobody awaited (a background refresh) must not be reported as never retrieved
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        # Shielded so one cancelled caller (e.g. a disconnected client) doesn't cancel the others' call
+        return await asyncio.shield(self.start(key, fn))
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self.calls, "collapsed": self.collapsed, "in_flight": len(self._inflight)}
+
+
+_groups: Dict[str, SingleFlight] = {}
+
+
+def singleflight_stats() -> Dict[str, Dict[str, int]]:
+    """Calls and collapsed calls of every single-flight group, by name"""
+    return {name: group.stats() for name, group in sorted(_groups.items())}
@@ -0,0 +1,104 @@
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class StoredSnapshot:
+    """One published live-pulse snapshot as shared between worker processes"""
+    version: int
+    events: List[dict]
+    fetched_at: float
+    changed_at: float
+    has_live_match: bool
+    content_hash: str
+    # Tracked players the scan that produced it couldn't read in time
+    missing: List[str] = field(default_factory=list)
+    # Published without events because SofaScore was unavailable
+    unavailable: bool = False
+
+
+class SnapshotStore:
+    """
+    Live-pulse snapshots shared by every worker process, backed by SQLite in WAL mode so
+    readers never block the writer. The leader (see leader.py) writes one row per snapshot
+    version and bumps fetched_at on polls that found nothing new; followers check the head
+    row every few seconds and load only versions they haven't seen. The last `history_size`
+    versions are kept, so `since` cursors work on any worker.
+    """
+
+    def __init__(self, path: str, history_size: int = 64):
+        self.path = path
+        self.history_size = history_size
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        # Another worker may hold the write lock for a moment
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS live_pulse_snapshots ("
+            " version INTEGER PRIMARY KEY,"
+            " events TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " changed_at REAL NOT NULL,"
+            " has_live_match INTEGER NOT NULL,"
+            " content_hash TEXT NOT NULL,"
+            " missing TEXT NOT NULL DEFAULT '[]',"
+            " unavailable INTEGER NOT NULL DEFAULT 0)"
+        )
+
+    def head(self) -> Optional[Tuple[int, float]]:
+        """(version, fetched_at) of the latest snapshot, or None if nothing was published yet"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT version, fetched_at FROM live_pulse_snapshots ORDER BY version DESC LIMIT 1"
+            ).fetchone()
+
+    def since(self, version: int) -> List[StoredSnapshot]:
+        """Snapshots newer than version, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT version, events, fetched_at, changed_at, has_live_match, content_hash, missing, unavailable"
+                " FROM live_pulse_snapshots WHERE version > ? ORDER BY version",
+                (version,)
+            ).fetchall()
+        return [
+            StoredSnapshot(row[0], json.loads(row[1]), row[2], row[3], bool(row[4]), row[5], json.loads(row[6]),
+                           bool(row[7]))
+            for row in rows
+        ]
+
+    def latest(self) -> Optional[StoredSnapshot]:
+        head = self.head()
+        return self.since(head[0] - 1)[-1] if head is not None else None
+
+    def put(self, snapshot: StoredSnapshot) -> None:
+        """Publish a snapshot; an existing version only has its poll time and live/missing/unavailable flags updated"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT INTO live_pulse_snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT (version) DO UPDATE SET"
+                    " fetched_at = excluded.fetched_at, has_live_match = excluded.has_live_match,"
+                    " missing = excluded.missing, unavailable = excluded.unavailable",
+                    (snapshot.version, json.dumps(snapshot.events, separators=(",", ":")),
+                     snapshot.fetched_at, snapshot.changed_at, int(snapshot.has_live_match),
+                     snapshot.content_hash, json.dumps(snapshot.missing), int(snapshot.unavailable))
+                )
+                self._conn.execute(
+                    "DELETE FROM live_pulse_snapshots WHERE version <= ?",
+                    (snapshot.version - self.history_size,)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,375 +1,671 @@
 import asyncio
-import tls_client
+import heapq
+import logging
+import random
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from models import PlayerEvent
-from players import CANADIAN_PLAYERS
+from config import settings
+from rate_limiter import AdaptiveRateLimiter, parse_retry_after
+from circuit_breaker import CircuitBreaker
+from cache import AsyncTTLCache
+from response_store import ResponseStore, StoredResponse
+from singleflight import SingleFlight
+from roster import SOFASCORE, Roster, RosterRegistry, roster_registry
+from season_store import CompetitionStats, SeasonStatsStore, aggregate_rows
+from incident_index import IncidentIndex
+from schedule_index import ScheduleIndex
+from timestamps import format_timestamp, incident_time
+from deadline import DeadlineExceeded, gather_within
+from transport import Transport, TransportError, create_transport
+from metrics import (
+    FETCH_QUEUE_WAIT, JSON_PARSE, RESPONSE_STORE_LOOKUPS, STALE_SERVED, UPSTREAM_INFLIGHT, UPSTREAM_LATENCY,
+    UPSTREAM_RESPONSES, UPSTREAM_RETRIES, endpoint_label, record_timing, register_cache
+)
+
+logger = logging.getLogger(__name__)
+
+
+# International competitions to exclude from season totals (not club competitions)
+INTERNATIONAL_COMPETITIONS = [
+    "CONCACAF Gold Cup",
+    "FIFA World Cup",
+    "Copa America",
+    "UEFA European Championship",
+    "Africa Cup of Nations",
+    "AFC Asian Cup",
+    "CONCACAF Nations League",
+    "UEFA Nations League",
+    "International Friendlies",
+    "World Cup Qualification",
+    "Olympic Games"
+]
+
+
+# Throttled (429/403) or server-side failures: retried with backoff and counted by the circuit breaker
+THROTTLE_STATUSES = {403, 429}
+RETRYABLE_STATUSES = THROTTLE_STATUSES | {500, 502, 503, 504}
+
+
+class SofaScoreError(Exception):
+    """Raised when a SofaScore request fails in a way that shouldn't be cached"""
+
+
+class SofaScoreUnavailable(SofaScoreError):
+    """SofaScore is throttling or down (retries exhausted, or the circuit is open)"""
+
+
+@dataclass
+class SeasonStatsResult:
+    """Season stats by player, and the tracked players they lack or only have stale numbers for"""
+    stats: Dict[str, Any] = field(default_factory=dict)
+    # Still loading when the budget ran out (or failed with nothing cached)
+    missing: List[str] = field(default_factory=list)
+    # Served from an entry past its TTL while a refresh runs
+    stale: List[str] = field(default_factory=list)
 
 
 class SofaScoreScraper:
     """
-    SofaScore API scraper using tls_client for browser-like TLS
+    SofaScore API scraper; HTTP goes through a pluggable Transport
+    (tls_client for browser-like TLS by default)
     """
     
-    def __init__(self):
+    def __init__(self, max_concurrency: int = None, requests_per_second: float = None,
+                 response_store: ResponseStore = None, transport: Transport = None,
+                 season_store: SeasonStatsStore = None, roster: RosterRegistry = None):
         self.base_url = "https://api.sofascore.com/api/v1"
-        # SofaScore player IDs (different from API-Football IDs)
-        self.sofascore_player_ids = {
-            "Alphonso Davies": 829035,
-            "Jonathan David": 935564,
-            "Tajon Buchanan": 896768,
-            "Stephen Eustáquio": 356740,
-            "Cyle Larin": 174659,
-            "Alistair Johnston": 922858,
-            "Ismaël Koné": 1273270,
-            "Maxime Crépeau": 104669,
-            "Kamal Miller": 848436,
-            "Richie Laryea": 297229,
-        }
-        # Create session with browser-like TLS
-        self.session = tls_client.Session(
-            client_identifier="chrome_120",
-            random_tls_extension_order=True
+        # Tracked players; SofaScore IDs come from the roster file and follow its reloads
+        self.roster = roster or roster_registry
+        # HTTP transport: pooled, with per-request timeouts
+        self.transport = transport or create_transport()
+        # SofaScore event IDs of tracked players' matches in progress at the last scan,
+        # and the event lists they were found in (scanned first next time)
+        self.live_event_ids: set[int] = set()
+        self.missing_players: List[str] = []
+        self._live_sources: set[str] = set()
+        # Kickoff times per club/player, so idle clubs' lists aren't re-read every poll
+        self.schedule = ScheduleIndex(active_window=settings.schedule_active_window)
+        # Fetch engine: bounded parallelism plus a global request budget
+        self._semaphore = asyncio.Semaphore(max_concurrency or settings.sofascore_max_concurrency)
+        self.rate_limiter = AdaptiveRateLimiter(
+            requests_per_second if requests_per_second is not None else settings.sofascore_requests_per_second,
+            min_rate=settings.sofascore_min_requests_per_second
+        )
+        # Stops upstream calls during an outage; callers fall back to stored responses
+        self.circuit_breaker = CircuitBreaker(
+            "sofascore",
+            failure_threshold=settings.sofascore_breaker_threshold,
+            reset_timeout=settings.sofascore_breaker_reset
+        )
+        # Raw JSON bodies persisted across restarts, keyed by URL path
+        self.response_store = response_store or ResponseStore(settings.response_store_path)
+        self._upstream = SingleFlight("sofascore_upstream")
+        # Per-competition season rows; season totals are recomputed from them
+        self.season_store = season_store or SeasonStatsStore(
+            response_store.path if response_store is not None else settings.response_store_path
         )
+        # Match incidents by SofaScore event ID, shared by all tracked players in the match
+        self.incident_index = IncidentIndex(self._fetch_incidents, live_ttl=settings.live_response_ttl)
+        # Per-player season totals (TTL + stale-while-revalidate, LRU-bounded)
+        self.season_stats_cache = AsyncTTLCache(
+            ttl=settings.season_stats_ttl,
+            max_entries=settings.season_stats_cache_size,
+            name="season_stats"
+        )
+        register_cache("season_stats", self.season_stats_cache)
+
+    @property
+    def sofascore_player_ids(self) -> Dict[str, int]:
+        """{player name: SofaScore player ID} for the current roster"""
+        return self.roster.current.provider_ids(SOFASCORE)
+
+    async def _get(self, url: str):
+        """Issue a GET through the fetch engine (concurrency limit + rate budget)"""
+        endpoint = endpoint_label(url[len(self.base_url):])
+        queued = time.perf_counter()
+        async with self._semaphore:
+            await self.rate_limiter.acquire()
+            started = time.perf_counter()
+            FETCH_QUEUE_WAIT.observe(started - queued)
+            record_timing("queue", started - queued)
+            
+            status = "error"
+            try:
+                with UPSTREAM_INFLIGHT.track_inprogress():
+                    response = await self.transport.get(url)
+                status = str(response.status_code)
+                return response
+            finally:
+                elapsed = time.perf_counter() - started
+                UPSTREAM_LATENCY.observe(elapsed, endpoint)
+                UPSTREAM_RESPONSES.inc(endpoint, status)
+                record_timing("upstream", elapsed)
 
-    def calculate_timestamp(self, match_time: str) -> str:
-        """Calculate relative timestamp from match time"""
+    async def _get_json(self, path: str, ttl: Optional[float], final: bool = False) -> Any:
+        """JSON body for a SofaScore path (see _get_stored)"""
+        return (await self._get_stored(path, ttl, final)).body
+    
+    async def _get_stored(self, path: str, ttl: Optional[float], final: bool = False) -> StoredResponse:
+        """
+        Return the stored response for a SofaScore path, served from the persistent response store
+        while younger than ttl seconds (ttl=None keeps it forever).
+        final=True means the body no longer changes upstream (a finished match's incidents): a body
+        stored as final is kept forever, one stored before (during live play) is fetched once more.
+        When SofaScore is unavailable the last stored body is served regardless of age (not as final).
+        Raises SofaScoreError on a non-200 response with nothing stored.
+        """
+        stored = self.response_store.get(path)
+        if stored is not None and (stored.final or (not final and (ttl is None or stored.age < ttl))):
+            RESPONSE_STORE_LOOKUPS.inc("hit")
+            return stored
+        RESPONSE_STORE_LOOKUPS.inc("miss")
+        # Concurrent misses for the same path (overlapping polls, several players in one
+        # club) share a single upstream fetch and its result or error
+        return await self._upstream.do(path, lambda: self._refresh_json(path, stored, final))
+
+    async def _refresh_json(self, path: str, stored: Optional[StoredResponse], final: bool = False) -> StoredResponse:
         try:
-            # Parse ISO format time
-            match_datetime = datetime.fromisoformat(match_time.replace('Z', '+00:00'))
-            now = datetime.now(timezone.utc)
-            diff = now - match_datetime
+            body = await self._fetch_json(path)
+        except SofaScoreUnavailable as e:
+            if stored is None:
+                raise
+            STALE_SERVED.inc()
+            logger.warning("Serving stored %s (%.0fs old): %s", path, stored.age, e)
+            return stored
+
+        self.response_store.put(path, body, final=final)
+        return StoredResponse(body=body, fetched_at=time.time(), final=final)
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Full-jitter exponential backoff, never shorter than the upstream's Retry-After"""
+        delay = random.uniform(0, min(settings.sofascore_backoff_max, settings.sofascore_backoff_base * 2 ** attempt))
+        return max(delay, retry_after or 0.0)
+
+    async def _fetch_json(self, path: str) -> Any:
+        """
+        GET a SofaScore path with retries on throttling, 5xx and transport errors.
+        Throttled responses slow the shared rate limiter; failures feed the circuit breaker.
+        """
+        endpoint = endpoint_label(path)
+        attempts = settings.sofascore_max_retries + 1
+        for attempt in range(attempts):
+            if not self.circuit_breaker.allow():
+                raise SofaScoreUnavailable(
+                    f"GET {path} skipped: circuit open for {self.circuit_breaker.retry_in():.0f}s"
+                )
             
-            if diff.total_seconds() < 60:
-                return "just now"
-            elif diff.total_seconds() < 3600:
-                minutes = int(diff.total_seconds() / 60)
-                return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
-            elif diff.total_seconds() < 86400:
-                hours = int(diff.total_seconds() / 3600)
-                return f"{hours} hour{'s' if hours != 1 else ''} ago"
+            retry_after = None
+            try:
+                response = await self._get(f"{self.base_url}{path}")
+            except TransportError as e:
+                reason, failure = "transport", str(e)
             else:
-                days = int(diff.total_seconds() / 86400)
-                return f"{days} day{'s' if days != 1 else ''} ago"
-        except Exception as e:
-            print(f"Error calculating timestamp: {e}")
-            return "recently"
+                if response.status_code == 200:
+                    self.circuit_breaker.record_success()
+                    self.rate_limiter.on_success()
+                    parse_start = time.perf_counter()
+                    body = response.json()
+                    parse_time = time.perf_counter() - parse_start
+                    JSON_PARSE.observe(parse_time, endpoint)
+                    record_timing("parse", parse_time)
+                    return body
+                if response.status_code not in RETRYABLE_STATUSES:
+                    # SofaScore answered (e.g. 404 for a player without stats): not an outage
+                    self.circuit_breaker.record_success()
+                    raise SofaScoreError(f"GET {path} failed (status: {response.status_code})")
+                reason, failure = str(response.status_code), f"status {response.status_code}"
+                if response.status_code in THROTTLE_STATUSES:
+                    retry_after = parse_retry_after(response.headers)
+                    self.rate_limiter.on_throttle(retry_after)
+            
+            self.circuit_breaker.record_failure(f"GET {path}: {failure}")
+            # A Retry-After beyond the backoff cap is left to the rate limiter rather than held here
+            if attempt + 1 == attempts or (retry_after or 0) > settings.sofascore_backoff_max:
+                break
+            UPSTREAM_RETRIES.inc(endpoint, reason)
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+        
+        raise SofaScoreUnavailable(f"GET {path} failed after {attempt + 1} attempt(s) ({failure})")
+
+    async def _fetch_incidents(self, event_id: int, finished: bool) -> Tuple[List[dict], bool]:
+        """
+        Incidents for one match, and whether they are final. Once the match is finished they are
+        fetched one more time (late goals and corrections) and then stored forever.
+        """
+        response = await self._get_stored(
+            f"/event/{event_id}/incidents", ttl=settings.live_response_ttl, final=finished
+        )
+        return response.body.get("incidents", []), response.final
 
-    async def get_canadian_player_events(self) -> List[PlayerEvent]:
+    async def _player_team(self, player_id: int) -> Optional[int]:
+        """SofaScore ID of the player's current club (re-read every sofascore_team_ttl seconds), or None"""
+        try:
+            data = await self._get_json(f"/player/{player_id}", ttl=settings.sofascore_team_ttl)
+        except SofaScoreError:
+            return None
+        return data.get("player", {}).get("team", {}).get("id")
+
+    async def _event_sources(self, player_ids: Dict[str, int], timeout: Optional[float]) -> Dict[str, List[str]]:
         """
-        Get recent events for Canadian players from SofaScore
-        Uses tls_client to bypass API restrictions
+        Event-list sources to scan, each with the names of the tracked players it covers:
+        /team/{id} once per club with tracked players (teammates share it), and /player/{id}
+        for players whose club can't be resolved (or isn't resolved within `timeout` seconds).
+        Clubs that had a live match at the last scan come first, so they get fetch slots first.
         """
-        all_events = []
-        event_id = 1
+        if settings.sofascore_batch_by_club:
+            team_ids = await gather_within(
+                (self._player_team(player_id) for player_id in player_ids.values()), timeout
+            )
+        else:
+            team_ids = [None] * len(player_ids)
         
+        sources: Dict[str, List[str]] = {}
+        for (name, player_id), team_id in zip(player_ids.items(), team_ids):
+            if isinstance(team_id, BaseException):
+                team_id = None
+            source = f"/team/{team_id}" if team_id is not None else f"/player/{player_id}"
+            sources.setdefault(source, []).append(name)
+        if settings.sofascore_national_team_id:
+            # Club lists don't include international matches
+            sources.setdefault(f"/team/{settings.sofascore_national_team_id}", [])
+        
+        return dict(sorted(sources.items(), key=lambda item: item[0] not in self._live_sources))
+
+    async def _read_list(self, path: str, ttl: float) -> List[dict]:
+        """One event list; SofaScore answers 404 when it is empty, which is stored like any list"""
         try:
-            print("\n🔍 Fetching player events from SofaScore...")
+            return (await self._get_json(path, ttl=ttl)).get("events", [])
+        except SofaScoreUnavailable:
+            raise
+        except SofaScoreError:
+            self.response_store.put(path, {"events": []})
+            return []
+
+    async def _read_source(self, source: str) -> List[dict]:
+        """
+        Recent and upcoming matches of one source. Lists are served from the store for up to
+        schedule_ttl seconds; only while the schedule says a match is on are they re-read
+        with the live TTL.
+        """
+        for ttl in (settings.schedule_ttl, settings.live_response_ttl):
+            recent, upcoming = await asyncio.gather(
+                self._read_list(f"{source}/events/last/0", ttl),
+                self._read_list(f"{source}/events/next/0", ttl)
+            )
+            events = recent + upcoming
+            self.schedule.update(source, events)
+            if not self.schedule.is_active(source):
+                break
+        return events
+
+    def _match_events(self, event: dict, match_incidents: Dict[int, list], roster: Roster) -> List[Tuple[tuple, PlayerEvent]]:
+        """
+        PlayerEvents for every tracked player involved in one match, each paired with its
+        time-order key (match start, minute, added time, id)
+        """
+        event_id = event["id"]
+        match_time = event.get("startTimestamp", 0)
+        
+        # Get match info
+        home_team = event.get("homeTeam", {}).get("name", "")
+        away_team = event.get("awayTeam", {}).get("name", "")
+        home_score = event.get("homeScore", {}).get("current", 0)
+        away_score = event.get("awayScore", {}).get("current", 0)
+        score_str = f"{home_score}-{away_score}"
+        tournament = event.get("tournament", {}).get("name", "Unknown League")
+        context = f"{home_team} {score_str} {away_team}"
+        
+        found = []
+        for player_id, player_incidents in match_incidents.items():
+            player = roster.by_id(SOFASCORE, player_id)
+            if player is None:
+                continue
+            for incident in player_incidents:
+                # Determine player's team
+                player_team = home_team if incident.is_home else away_team
+                
+                logger.debug("Found: %s - %s at %s' in %s", player.name, incident.name, incident.minute, context)
+                
+                occurred_at = incident_time(match_time or None, incident.minute, incident.added_time)
+                player_event = PlayerEvent(
+                    id=f"{event_id}-{incident.incident_key}-{player_id}-{incident.type}",
+                    player=player.name,
+                    event=incident.name,
+                    type=incident.type,
+                    context=context,
+                    minute=f"{incident.minute}'",
+                    timestamp=format_timestamp(occurred_at),
+                    league=tournament,
+                    team=player_team,
+                    kickoff_at=match_time or None,
+                    occurred_at=occurred_at
+                )
+                found.append(((match_time, incident.minute, incident.added_time, player_event.id), player_event))
+        return found
+
+    async def get_canadian_player_events(self, limit: int = None) -> List[PlayerEvent]:
+        """
+        Most recent events for Canadian players from SofaScore (live and recently finished
+        matches), newest first.
+        Match-centric: the event lists of each club with tracked players, then each distinct
+        match's incidents once, credited to every tracked player in it. The schedule index keeps
+        idle clubs' lists in the store, so a poll with no match on makes no upstream calls.
+        The merged incidents are cut to the `limit` most recent
+        (default: settings.live_pulse_history_size) by match start time and minute.
+        """
+        return [event for _, event in await self.scan_player_events(limit)]
+
+    async def scan_player_events(self, limit: int = None,
+                                 player_ids: Optional[Dict[str, int]] = None) -> List[Tuple[tuple, PlayerEvent]]:
+        """
+        get_canadian_player_events with each event's time-order key, so results of separate
+        scans can be merged. player_ids ({name: SofaScore ID}) restricts the scan to part of the
+        roster, e.g. one scraper worker's shard; events are still credited to any tracked player.
+        """
+        limit = limit or settings.live_pulse_history_size
+        # One roster snapshot for the whole scan, even if the file is reloaded meanwhile
+        roster = self.roster.current
+        if player_ids is None:
+            player_ids = roster.provider_ids(SOFASCORE)
+        tracked_ids = roster.ids(SOFASCORE)
+        
+        logger.debug("Fetching player events from SofaScore")
+        # Each phase (club lookups, event lists, match incidents) gets the full scan budget, so a
+        # slow phase can't leave the next one nothing; reads still running carry on in the background
+        budget = settings.live_pulse_scan_budget or None
+        sources = await self._event_sources(player_ids, budget)
+        self.schedule.forget(sources)
+        event_lists = await gather_within((self._read_source(source) for source in sources), budget)
+        
+        # Live and recently finished matches, each once even when several tracked clubs or players share it
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=2)).timestamp()
+        matches: Dict[int, dict] = {}
+        match_sources: Dict[int, set] = {}
+        live_event_ids = set()
+        live_sources = set()
+        missing = set()
+        unavailable = 0
+        for source, result in zip(sources, event_lists):
+            if isinstance(result, DeadlineExceeded):
+                missing.update(sources[source])
+                continue
+            if isinstance(result, SofaScoreError):
+                if isinstance(result, SofaScoreUnavailable):
+                    unavailable += 1
+                    missing.update(sources[source])
+                logger.warning("%s", result)
+                continue
+            if isinstance(result, Exception):
+                logger.warning("Error reading %s: %s", source, result)
+                continue
             
-            # Try to fetch last events for each player
-            for player_name, player_id in self.sofascore_player_ids.items():
-                try:
-                    # Get player's last events
-                    url = f"{self.base_url}/player/{player_id}/events/last/0"
-                    
-                    # Run synchronous request in thread pool
-                    response = await asyncio.to_thread(self.session.get, url)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        events = data.get("events", [])
-                        
-                        print(f"   Checking {player_name}...")
-                        
-                        # Process recent events (last 2 days)
-                        cutoff_time = datetime.now(timezone.utc) - timedelta(days=2)
-                        
-                        for event in events[:3]:  # Check last 3 matches
-                            match_time = event.get("startTimestamp", 0)
-                            event_datetime = datetime.fromtimestamp(match_time, tz=timezone.utc)
-                            
-                            # Skip old matches
-                            if event_datetime < cutoff_time:
-                                continue
-                            
-                            # Check if match is finished
-                            status = event.get("status", {}).get("type", "")
-                            if status not in ["finished"]:
-                                continue
-                            
-                            event_id_num = event.get("id")
-                            if not event_id_num:
-                                continue
-                            
-                            # Get match incidents
-                            incidents_url = f"{self.base_url}/event/{event_id_num}/incidents"
-                            inc_response = await asyncio.to_thread(self.session.get, incidents_url)
-                            
-                            if inc_response.status_code != 200:
-                                continue
-                            
-                            incidents_data = inc_response.json()
-                            incidents = incidents_data.get("incidents", [])
-                            
-                            if not incidents:
-                                continue
-                            
-                            # Get match info
-                            home_team = event.get("homeTeam", {}).get("name", "")
-                            away_team = event.get("awayTeam", {}).get("name", "")
-                            home_score = event.get("homeScore", {}).get("current", 0)
-                            away_score = event.get("awayScore", {}).get("current", 0)
-                            score_str = f"{home_score}-{away_score}"
-                            tournament = event.get("tournament", {}).get("name", "Unknown League")
-                            
-                            # Process each incident for this player
-                            for incident in incidents:
-                                incident_player = incident.get("player", {})
-                                if not incident_player:
-                                    continue
-                                
-                                incident_player_id = incident_player.get("id")
-                                event_type = None
-                                event_name = None
-                                
-                                if incident_player_id != player_id:
-                                    # Check for assists
-                                    assist_player = incident.get("assist1", {})
-                                    if assist_player.get("id") != player_id:
-                                        continue
-                                    else:
-                                        # This is an assist
-                                        event_type = "assist"
-                                        event_name = "Assist"
-                                else:
-                                    # Parse incident type
-                                    incident_type = incident.get("incidentType", "")
-                                    
-                                    if incident_type == "goal":
-                                        event_type = "goal"
-                                        event_name = "Goal"
-                                    elif incident_type == "yellowCard":
-                                        event_type = "card"
-                                        event_name = "Yellow Card"
-                                    elif incident_type == "redCard":
-                                        event_type = "card"
-                                        event_name = "Red Card"
-                                    elif incident_type == "substitution":
-                                        if incident.get("playerIn", {}).get("id") == player_id:
-                                            event_type = "substitution"
-                                            event_name = "Substitution"
-                                        else:
-                                            continue
-                                    else:
-                                        continue
-                                
-                                if not event_type:
-                                    continue
-                                
-                                minute = incident.get("time", 0)
-                                context = f"{home_team} {score_str} {away_team}"
-                                timestamp = self.calculate_timestamp_from_unix(match_time)
-                                
-                                # Determine player's team
-                                is_home = incident.get("isHome", False)
-                                player_team = home_team if is_home else away_team
-                                
-                                print(f"      ✅ Found: {player_name} - {event_name} at {minute}' in {context}")
-                                
-                                all_events.append(PlayerEvent(
-                                    id=event_id,
-                                    player=player_name,
-                                    event=event_name,
-                                    type=event_type,
-                                    context=context,
-                                    minute=f"{minute}'",
-                                    timestamp=timestamp,
-                                    league=tournament,
-                                    team=player_team
-                                ))
-                                event_id += 1
-                        
-                        # Small delay between requests
-                        await asyncio.sleep(0.5)
-                        
-                    else:
-                        print(f"   ⚠️ Could not fetch data for {player_name} (status: {response.status_code})")
-                    
-                    if len(all_events) >= 8:
-                        break
-                        
-                except Exception as e:
-                    print(f"   Error processing player {player_name}: {e}")
+            for event in result:
+                event_id = event.get("id")
+                if not event_id:
+                    continue
+                status = event.get("status", {}).get("type", "")
+                # Remember in-progress matches so the poller can tighten its schedule
+                if status == "inprogress":
+                    live_event_ids.add(event_id)
+                    live_sources.add(source)
+                    matches[event_id] = event
+                elif status == "finished" and event.get("startTimestamp", 0) >= cutoff:
+                    matches[event_id] = event
+                else:
                     continue
+                match_sources.setdefault(event_id, set()).add(source)
         
-        except Exception as e:
-            print(f"❌ Error getting player events: {e}")
-            import traceback
-            traceback.print_exc()
+        # An outage with nothing stored isn't "no events": let the caller keep its last good result
+        if unavailable and unavailable == len(sources):
+            raise SofaScoreUnavailable("SofaScore unavailable for every tracked player")
+        
+        self.live_event_ids = live_event_ids
+        self._live_sources = live_sources
+        
+        # Newest matches first, so they are ahead in the fetch engine's queue
+        ordered = sorted(matches.values(), key=lambda event: event.get("startTimestamp", 0), reverse=True)
+        resolved = await gather_within((
+            # Resolved once per match for every tracked player, reused across polls
+            self.incident_index.get(
+                event["id"], finished=event["status"]["type"] == "finished", tracked_ids=tracked_ids
+            )
+            for event in ordered
+        ), budget)
         
-        print(f"\n✅ Total events found: {len(all_events)}")
+        keyed_events = []
+        for event, match_incidents in zip(ordered, resolved):
+            if isinstance(match_incidents, DeadlineExceeded):
+                # The players of the clubs in this match may have events not shown yet
+                for source in match_sources[event["id"]]:
+                    missing.update(sources[source])
+                continue
+            if isinstance(match_incidents, Exception):
+                logger.warning("Incidents for event %s: %s", event["id"], match_incidents)
+                continue
+            keyed_events.extend(self._match_events(event, match_incidents, roster))
         
-        # Sort by most recent and return top 8
-        return sorted(all_events, key=lambda x: x.id, reverse=True)[:8] if all_events else []
+        # Tracked players whose events may be incomplete (read timed out or SofaScore unavailable)
+        self.missing_players = sorted(missing)
+        logger.info(
+            "Live pulse scan: %d events in %d matches (%d live), %d sources for %d players, %d incomplete",
+            len(keyed_events), len(matches), len(live_event_ids), len(sources), len(player_ids), len(missing)
+        )
+        
+        # Bounded heap: only the `limit` most recent incidents are kept, newest first
+        return heapq.nlargest(limit, keyed_events, key=lambda item: item[0])
     
-    def calculate_timestamp_from_unix(self, unix_timestamp: int) -> str:
-        """Calculate relative timestamp from Unix timestamp"""
-        try:
-            match_datetime = datetime.fromtimestamp(unix_timestamp, tz=timezone.utc)
-            now = datetime.now(timezone.utc)
-            diff = now - match_datetime
-            
-            if diff.total_seconds() < 60:
-                return "just now"
-            elif diff.total_seconds() < 3600:
-                minutes = int(diff.total_seconds() / 60)
-                return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
-            elif diff.total_seconds() < 86400:
-                hours = int(diff.total_seconds() / 3600)
-                return f"{hours} hour{'s' if hours != 1 else ''} ago"
-            else:
-                days = int(diff.total_seconds() / 86400)
-                return f"{days} day{'s' if days != 1 else ''} ago"
-        except Exception as e:
-            print(f"Error calculating timestamp: {e}")
-            return "recently"
-
-
     async def get_player_season_stats(self, player_name: str = None) -> Dict[str, Any]:
         """
         Get current season statistics for Canadian players from SofaScore
         Returns TOTAL season data aggregated across all competitions (not just one league)
         """
-        all_stats = {}
+        return (await self.season_stats_within(player_name)).stats
+    
+    async def season_stats_within(self, player_name: str = None, budget: Optional[float] = None) -> SeasonStatsResult:
+        """
+        Season stats as get_player_season_stats, returned after at most `budget` seconds (None: no limit).
+        Players are fetched concurrently; the fetch engine bounds parallelism and request rate.
+        Results are cached per player, so single-player and all-player requests share entries;
+        players not loaded within the budget are reported as missing and keep loading in the
+        background, so the next request finds them cached.
+        """
+        result = SeasonStatsResult()
         
         try:
-            print(f"\n📊 Fetching season statistics from SofaScore...")
+            logger.debug("Fetching season statistics from SofaScore")
             
-            # If specific player requested, filter to that player
-            players_to_fetch = self.sofascore_player_ids
-            if player_name and player_name in self.sofascore_player_ids:
-                players_to_fetch = {player_name: self.sofascore_player_ids[player_name]}
+            # If specific player requested, filter to that player (matched ignoring accents and case)
+            roster = self.roster.current
+            players_to_fetch = roster.provider_ids(SOFASCORE)
+            player = roster.get(player_name) if player_name else None
+            if player is not None and SOFASCORE in player.ids:
+                players_to_fetch = {player.name: player.ids[SOFASCORE]}
             
-            for player_name, player_id in players_to_fetch.items():
-                try:
-                    # Get player statistics for current season
-                    url = f"{self.base_url}/player/{player_id}/statistics/seasons"
-                    
-                    response = await asyncio.to_thread(self.session.get, url)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        unique_tournaments = data.get("uniqueTournamentSeasons", [])
-                        
-                        # Aggregate stats across all competitions for 25/26 season
-                        total_matches = 0
-                        total_minutes = 0
-                        total_goals = 0
-                        total_assists = 0
-                        total_ratings = []
-                        team_name = "Unknown"
-                        found_season = False
-                        
-                        # List of international competitions to exclude (not club competitions)
-                        international_competitions = [
-                            "CONCACAF Gold Cup",
-                            "FIFA World Cup",
-                            "Copa America",
-                            "UEFA European Championship",
-                            "Africa Cup of Nations",
-                            "AFC Asian Cup",
-                            "CONCACAF Nations League",
-                            "UEFA Nations League",
-                            "International Friendlies",
-                            "World Cup Qualification",
-                            "Olympic Games"
-                        ]
-                        
-                        for tournament in unique_tournaments:
-                            seasons = tournament.get("seasons", [])
-                            for season in seasons:
-                                # Look for 2025/2026 season
-                                season_name = season.get("name", "")
-                                if "25/26" in season_name or "2025" in season_name:
-                                    season_id = season.get("id")
-                                    tournament_id = tournament.get("uniqueTournament", {}).get("id")
-                                    
-                                    # Get team name from first season found
-                                    if team_name == "Unknown":
-                                        team_name = season.get("team", {}).get("name", "Unknown")
-                                    
-                                    # Fetch detailed stats for this tournament/season
-                                    stats_url = f"{self.base_url}/player/{player_id}/unique-tournament/{tournament_id}/season/{season_id}/statistics/overall"
-                                    stats_response = await asyncio.to_thread(self.session.get, stats_url)
-                                    
-                                    if stats_response.status_code == 200:
-                                        stats_data = stats_response.json()
-                                        statistics = stats_data.get("statistics", {})
-                                        
-                                        league_name = tournament.get("uniqueTournament", {}).get("name", "Unknown")
-                                        
-                                        # Skip international competitions
-                                        if league_name in international_competitions:
-                                            print(f"      ⏭️  Skipping {league_name} (international competition)")
-                                            continue
-                                        
-                                        # Aggregate stats from this competition
-                                        matches = statistics.get("appearances", 0)
-                                        if matches > 0:
-                                            found_season = True
-                                            total_matches += matches
-                                            total_minutes += statistics.get("minutesPlayed", 0)
-                                            total_goals += statistics.get("goals", 0)
-                                            total_assists += statistics.get("assists", 0)
-                                            rating = statistics.get("rating", 0)
-                                            if rating > 0:
-                                                total_ratings.append(rating)
-                                            
-                                            league_name = tournament.get("uniqueTournament", {}).get("name", "Unknown")
-                                            minutes_in_comp = statistics.get("minutesPlayed", 0)
-                                            print(f"      - {league_name}: {matches} matches, {minutes_in_comp} mins, {statistics.get('goals', 0)}G {statistics.get('assists', 0)}A")
-                        
-                        if found_season and total_matches > 0:
-                            # Calculate average rating weighted by matches played
-                            avg_rating = sum(total_ratings) / len(total_ratings) if total_ratings else 0
-                            
-                            all_stats[player_name] = {
-                                "player": player_name,
-                                "team": team_name,
-                                "league": "All Competitions",
-                                "season": "2025/26",
-                                "matches": total_matches,
-                                "minutes": total_minutes,
-                                "goals": total_goals,
-                                "assists": total_assists,
-                                "rating": round(avg_rating, 2) if avg_rating else 0,
-                                "form_rating": round(avg_rating * 10, 0) if avg_rating else 0  # Scale to 0-100
-                            }
-                            
-                            print(f"   ✅ {player_name}: {total_matches} matches, {total_goals} goals, {total_assists} assists ({team_name})")
-                        else:
-                            print(f"   ⚠️ No 25/26 season data found for {player_name}")
-                    
-                    else:
-                        print(f"   ⚠️ Could not fetch stats for {player_name} (status: {response.status_code})")
-                    
-                    # Small delay between requests
-                    await asyncio.sleep(0.3)
-                    
-                except Exception as e:
-                    print(f"   ❌ Error processing {player_name}: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    continue
+            # Checked before the gets, which start the refresh of stale entries
+            result.stale = [name for name in players_to_fetch if self.season_stats_cache.is_stale(name)]
+            results = await gather_within((
+                self.season_stats_cache.get(
+                    name, lambda name=name, player_id=player_id: self._fetch_player_season_stats(name, player_id)
+                )
+                for name, player_id in players_to_fetch.items()
+            ), budget)
             
-            print(f"\n✅ Stats fetched for {len(all_stats)} players")
+            for name, stats in zip(players_to_fetch, results):
+                if isinstance(stats, DeadlineExceeded):
+                    result.missing.append(name)
+                elif isinstance(stats, Exception):
+                    logger.warning("Error processing %s: %s", name, stats)
+                    if isinstance(stats, SofaScoreError):
+                        result.missing.append(name)
+                elif stats:
+                    result.stats[name] = stats
+            
+            logger.debug(
+                "Stats fetched for %d players (%d missing, %d stale)",
+                len(result.stats), len(result.missing), len(result.stale)
+            )
             
         except Exception as e:
-            print(f"❌ Error getting season statistics: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error getting season statistics: %s", e)
         
-        return all_stats
+        return result
+
+    async def _competition_fingerprints(self, player_id: int) -> Optional[Dict[Tuple[int, int], str]]:
+        """
+        Latest finished match per (unique tournament id, season id) from the recent events of
+        the player's club (or the player's own list), which the live pulse already keeps fresh.
+        None if the list can't be fetched.
+        """
+        team_id = await self._player_team(player_id) if settings.sofascore_batch_by_club else None
+        path = f"/team/{team_id}/events/last/0" if team_id else f"/player/{player_id}/events/last/0"
+        try:
+            # The live pulse re-reads this list whenever a match is on, so the schedule TTL is enough
+            data = await self._get_json(path, ttl=settings.schedule_ttl)
+        except SofaScoreError:
+            return None
+        
+        latest: Dict[Tuple[int, int], int] = {}
+        for event in data.get("events", []):
+            if event.get("status", {}).get("type") != "finished" or not event.get("id"):
+                continue
+            key = (event.get("tournament", {}).get("uniqueTournament", {}).get("id"), event.get("season", {}).get("id"))
+            latest[key] = max(latest.get(key, 0), event["id"])
+        return {key: str(event_id) for key, event_id in latest.items()}
+
+    def _row_is_current(self, row: Optional[CompetitionStats], fingerprint: Optional[str],
+                        fingerprints_known: bool) -> bool:
+        """Whether a stored competition row can be reused instead of re-fetching statistics/overall"""
+        if row is None or row.age >= settings.season_row_max_age:
+            return False
+        if not fingerprints_known:
+            # Without the recent events list, fall back to plain time-based freshness
+            return row.age < settings.season_response_ttl
+        return row.fingerprint == fingerprint
+
+    async def _fetch_competition_stats(self, player_id: int, tournament_id: int, season_id: int,
+                                       league_name: str, fingerprint: Optional[str]) -> CompetitionStats:
+        stats_path = f"/player/{player_id}/unique-tournament/{tournament_id}/season/{season_id}/statistics/overall"
+        # Straight to the upstream: the fingerprint already decided the stored row is out of date
+        statistics = (await self._fetch_json(stats_path)).get("statistics", {})
+        row = CompetitionStats(
+            tournament_id=tournament_id,
+            season_id=season_id,
+            league=league_name,
+            appearances=statistics.get("appearances", 0) or 0,
+            minutes=statistics.get("minutesPlayed", 0) or 0,
+            goals=statistics.get("goals", 0) or 0,
+            assists=statistics.get("assists", 0) or 0,
+            rating=statistics.get("rating", 0) or 0,
+            fingerprint=fingerprint,
+            fetched_at=time.time()
+        )
+        self.season_store.put(player_id, row)
+        return row
+
+    async def _fetch_player_season_stats(self, player_name: str, player_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Aggregate 25/26 club stats for one player, or None if they have no 25/26 data.
+        Per-competition rows are kept in the season store; only competitions with a new
+        finished match since their row was fetched are requested again.
+        Raises SofaScoreError when the upstream call fails, so the failure isn't cached.
+        """
+        # Get player statistics for current season
+        data = await self._get_json(f"/player/{player_id}/statistics/seasons", ttl=settings.season_response_ttl)
+        unique_tournaments = data.get("uniqueTournamentSeasons", [])
+        
+        team_name = "Unknown"
+        competitions = []
+        
+        for tournament in unique_tournaments:
+            seasons = tournament.get("seasons", [])
+            for season in seasons:
+                # Look for 2025/2026 season
+                season_name = season.get("name", "")
+                if "25/26" in season_name or "2025" in season_name:
+                    season_id = season.get("id")
+                    tournament_id = tournament.get("uniqueTournament", {}).get("id")
+                    
+                    # Get team name from first season found
+                    if team_name == "Unknown":
+                        team_name = season.get("team", {}).get("name", "Unknown")
+                    
+                    # Skip international competitions before spending a request on them
+                    league_name = tournament.get("uniqueTournament", {}).get("name", "Unknown")
+                    if league_name in INTERNATIONAL_COMPETITIONS:
+                        logger.debug("Skipping %s (international competition)", league_name)
+                        continue
+                    
+                    competitions.append((tournament_id, season_id, league_name))
+        
+        fingerprints = await self._competition_fingerprints(player_id)
+        stored = self.season_store.rows(player_id)
+        
+        rows = []
+        stale = []
+        for tournament_id, season_id, league_name in competitions:
+            key = (tournament_id, season_id)
+            fingerprint = fingerprints.get(key) if fingerprints is not None else None
+            if self._row_is_current(stored.get(key), fingerprint, fingerprints is not None):
+                rows.append(stored[key])
+            else:
+                stale.append((tournament_id, season_id, league_name, fingerprint))
+        
+        # Re-fetch only the competitions that changed, all at once
+        fetched = await asyncio.gather(*(
+            self._fetch_competition_stats(player_id, *competition) for competition in stale
+        ), return_exceptions=True)
+        logger.debug(
+            "%s: %d competition rows reused, %d re-fetched", player_name, len(rows), len(stale)
+        )
+        
+        for (tournament_id, season_id, _, _), row in zip(stale, fetched):
+            previous = stored.get((tournament_id, season_id))
+            # During an outage the previous row stands in; without one the whole player fails
+            # (so the cache keeps serving the previous totals instead of caching partial ones)
+            if isinstance(row, SofaScoreUnavailable) and previous is not None:
+                rows.append(previous)
+                continue
+            # A competition without stats is skipped
+            if isinstance(row, SofaScoreError) and not isinstance(row, SofaScoreUnavailable):
+                continue
+            if isinstance(row, Exception):
+                raise row
+            rows.append(row)
+        
+        for row in rows:
+            if row.appearances > 0:
+                logger.debug(
+                    "%s - %s: %s matches, %s mins, %sG %sA", player_name, row.league, row.appearances,
+                    row.minutes, row.goals, row.assists
+                )
+        
+        totals = aggregate_rows(rows)
+        if totals["matches"] == 0:
+            logger.info("No 25/26 season data found for %s", player_name)
+            return None
+        
+        logger.debug(
+            "%s: %d matches, %d goals, %d assists (%s)",
+            player_name, totals["matches"], totals["goals"], totals["assists"], team_name
+        )
+        
+        # Rating weighted by minutes played in each competition
+        avg_rating = totals["rating"]
+        return {
+            "player": player_name,
+            "team": team_name,
+            "league": "All Competitions",
+            "season": "2025/26",
+            "matches": totals["matches"],
+            "minutes": totals["minutes"],
+            "goals": totals["goals"],
+            "assists": totals["assists"],
+            "rating": round(avg_rating, 2) if avg_rating else 0,
+            "form_rating": round(avg_rating * 10, 0) if avg_rating else 0  # Scale to 0-100
+        }
 
 
 sofascore_scraper = SofaScoreScraper()
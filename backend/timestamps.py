@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+from typing import Optional, Union
+
+
+def to_epoch(value: Union[str, int, float, None]) -> Optional[int]:
+    """Epoch seconds from an ISO 8601 string (API-Football) or a Unix timestamp (SofaScore)"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+    except ValueError:
+        return None
+
+
+def incident_time(kickoff: Optional[int], minute: int, added_time: int = 0) -> Optional[int]:
+    """
+    Approximate epoch time of an incident from kickoff and the match clock, allowing 15 minutes
+    of half-time for second-half minutes. Only as good as the clock: stoppages aren't known.
+    """
+    if kickoff is None:
+        return None
+    half_time = 15 if minute > 45 else 0
+    return kickoff + (minute + added_time + half_time) * 60
+
+
+def format_timestamp(epoch: Optional[int]) -> str:
+    """
+    The legacy PlayerEvent.timestamp text: absolute UTC ISO 8601 ("2025-12-26T05:14:00Z"), so a
+    payload only changes when its data does. Clients render relative times from the epoch fields.
+    """
+    if epoch is None:
+        return ""
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+import tls_client
+from tls_client.exceptions import TLSClientExeption
+
+from config import settings
+from metrics import TRANSPORT_QUEUE_WAIT
+
+
+class TransportError(Exception):
+    """Upstream request failed before a response arrived (timeout, connection error)"""
+
+
+@dataclass
+class TransportResponse:
+    """Minimal response used by FakeTransport; real transports return their client's response,
+    which exposes the same status_code, headers and json()"""
+    status_code: int
+    body: Any = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    def json(self) -> Any:
+        return json.loads(self.body) if isinstance(self.body, (str, bytes)) else self.body
+
+
+class Transport(ABC):
+    """How the scraper talks HTTP; swap implementations without touching scraping logic"""
+
+    @abstractmethod
+    async def get(self, url: str, timeout: Optional[float] = None):
+        """GET url and return a response with status_code, headers and json()"""
+
+    async def close(self) -> None:
+        pass
+
+
+class TLSClientTransport(Transport):
+    """
+    tls_client (browser TLS fingerprint) on a dedicated, sized executor.
+    Each executor thread owns its own Session, so no session is shared across threads.
+    """
+
+    def __init__(self, max_workers: int = None, timeout: float = None,
+                 session_factory: Callable[[], Any] = None):
+        self.timeout = timeout or settings.sofascore_timeout
+        self.session_factory = session_factory or (
+            lambda: tls_client.Session(client_identifier="chrome_120", random_tls_extension_order=True)
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.sofascore_pool_size,
+            thread_name_prefix="sofascore-tls"
+        )
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self.session_factory()
+        return session
+
+    def _get_sync(self, url: str, timeout: float, submitted: float):
+        TRANSPORT_QUEUE_WAIT.observe(time.perf_counter() - submitted)
+        return self._session().get(url, timeout_seconds=max(1, round(timeout)))
+
+    async def get(self, url: str, timeout: Optional[float] = None):
+        timeout = timeout or self.timeout
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, self._get_sync, url, timeout, time.perf_counter())
+        try:
+            # tls_client enforces the timeout itself; this bounds the wait if it doesn't
+            return await asyncio.wait_for(future, timeout + 1)
+        except asyncio.TimeoutError as e:
+            raise TransportError(f"GET {url} timed out after {timeout}s") from e
+        except TLSClientExeption as e:
+            raise TransportError(f"GET {url} failed: {e}") from e
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class HttpxTransport(Transport):
+    """Native async client with a sized keep-alive connection pool (no browser TLS fingerprint)"""
+
+    def __init__(self, pool_size: int = None, keepalive_expiry: float = None, timeout: float = None):
+        pool_size = pool_size or settings.sofascore_pool_size
+        self.timeout = timeout or settings.sofascore_timeout
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+                keepalive_expiry=keepalive_expiry or settings.sofascore_keepalive_expiry
+            ),
+            timeout=self.timeout,
+            http2=False
+        )
+
+    async def get(self, url: str, timeout: Optional[float] = None):
+        try:
+            return await self._client.get(url, timeout=timeout or self.timeout)
+        except httpx.TransportError as e:
+            raise TransportError(f"GET {url} failed: {e!r}") from e
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class FakeTransport(Transport):
+    """In-process transport for the benchmarks: handler(url) returns a TransportResponse"""
+
+    def __init__(self, handler: Callable[[str], TransportResponse], latency: float = 0.0):
+        self.handler = handler
+        self.latency = latency
+        self.calls = 0
+
+    async def get(self, url: str, timeout: Optional[float] = None):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.handler(url)
+
+
+def create_transport() -> Transport:
+    """Build the transport selected by SOFASCORE_TRANSPORT"""
+    if settings.sofascore_transport == "httpx":
+        return HttpxTransport()
+    return TLSClientTransport()
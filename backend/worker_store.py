@@ -0,0 +1,133 @@
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+
+@dataclass(frozen=True)
+class WorkerResult:
+    """One scraper worker's latest scan of its shard"""
+    worker_id: str
+    # [time-order key, PlayerEvent fields] pairs, newest first
+    events: List[Tuple[list, dict]]
+    live_event_ids: List[int]
+    fetched_at: float
+    cycle_seconds: float
+    # Players in the shard whose events may be incomplete (reads timed out or failed)
+    missing: List[str] = field(default_factory=list)
+    # Names of the players in the worker's shard when it scanned
+    players: List[str] = field(default_factory=list)
+    # The worker stopped or stopped heartbeating; set by WorkerStore.results, not stored
+    stale: bool = False
+
+
+class WorkerStore:
+    """
+    Scraper worker membership and results, shared through SQLite (WAL) between the worker
+    processes and the API. Workers heartbeat into scraper_workers and publish their latest
+    scan into worker_results; a worker whose heartbeat is older than the timeout is dead, and
+    its players are reassigned (see ShardCoordinator). A departed worker's last result is kept,
+    marked stale, until the survivors publish results covering its players (see WorkerEventSource).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scraper_workers ("
+            " worker_id TEXT PRIMARY KEY,"
+            " pid INTEGER NOT NULL,"
+            " heartbeat_at REAL NOT NULL,"
+            " players INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS worker_results ("
+            " worker_id TEXT PRIMARY KEY,"
+            " events TEXT NOT NULL,"
+            " live_event_ids TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " cycle_seconds REAL NOT NULL,"
+            " missing TEXT NOT NULL DEFAULT '[]',"
+            " players TEXT NOT NULL DEFAULT '[]')"
+        )
+
+    def heartbeat(self, worker_id: str, pid: int, players: int = 0) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO scraper_workers VALUES (?, ?, ?, ?)",
+                (worker_id, pid, time.time(), players)
+            )
+
+    def remove(self, worker_id: str) -> None:
+        """
+        Deregister on a clean shutdown, so the others take over without waiting for the timeout.
+        The worker's last result stays (stale) until theirs cover its players.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM scraper_workers WHERE worker_id = ?", (worker_id,))
+
+    def discard_result(self, worker_id: str, timeout: float) -> None:
+        """Drop a departed worker's result once other workers cover its players (kept if it came back)"""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM worker_results WHERE worker_id = ?"
+                " AND worker_id NOT IN (SELECT worker_id FROM scraper_workers WHERE heartbeat_at >= ?)",
+                (worker_id, time.time() - timeout)
+            )
+
+    def live_workers(self, timeout: float) -> List[str]:
+        """IDs of workers that heartbeated in the last `timeout` seconds, sorted"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT worker_id FROM scraper_workers WHERE heartbeat_at >= ? ORDER BY worker_id",
+                (time.time() - timeout,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def workers(self) -> List[dict]:
+        """Every registered worker with its heartbeat age and shard size"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT worker_id, pid, heartbeat_at, players FROM scraper_workers ORDER BY worker_id"
+            ).fetchall()
+        now = time.time()
+        return [
+            {"worker_id": row[0], "pid": row[1], "heartbeat_age": round(now - row[2], 1), "players": row[3]}
+            for row in rows
+        ]
+
+    def publish(self, result: WorkerResult) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO worker_results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (result.worker_id, json.dumps(result.events, separators=(",", ":")),
+                 json.dumps(result.live_event_ids), result.fetched_at, result.cycle_seconds,
+                 json.dumps(result.missing), json.dumps(result.players))
+            )
+
+    def results(self, timeout: float) -> List[WorkerResult]:
+        """Latest result of every worker; those of workers gone for `timeout` seconds are marked stale"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT r.worker_id, r.events, r.live_event_ids, r.fetched_at, r.cycle_seconds, r.missing,"
+                " r.players, w.heartbeat_at"
+                " FROM worker_results r LEFT JOIN scraper_workers w USING (worker_id)"
+                " ORDER BY r.worker_id"
+            ).fetchall()
+        cutoff = time.time() - timeout
+        return [
+            WorkerResult(row[0], [tuple(pair) for pair in json.loads(row[1])], json.loads(row[2]), row[3], row[4],
+                         json.loads(row[5]), json.loads(row[6]), stale=row[7] is None or row[7] < cutoff)
+            for row in rows
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -4,9 +4,10 @@ import { Card } from "@/components/ui/card";
 import { Badge } from "@/components/ui/badge";
 import { Avatar, AvatarFallback, AvatarImage } from "@/components/ui/avatar";
 import { useEffect, useState } from "react";
+import { timeAgo } from "@/lib/utils";
 
 interface PlayerEvent {
-  id: number;
+  id: string;
   player: string;
   event: string;
   type: "goal" | "assist" | "card" | "substitution";
@@ -15,19 +16,26 @@ interface PlayerEvent {
   timestamp: string;
   league: string;
   team?: string;
+  kickoff_at?: number | null;
+  occurred_at?: number | null;
 }
 
 interface LivePulseResponse {
   events: PlayerEvent[];
   last_updated: string;
+  cursor: number;
+  next_before: string | null;
 }
 
 export function LivePulse() {
   const [events, setEvents] = useState<PlayerEvent[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  // Relative times are rendered here, so re-render them every minute
+  const [now, setNow] = useState(() => Date.now());
 
-  const fetchEvents = async () => {
+  // Returns the snapshot's cursor (null on failure), so the stream can resume right after it
+  const fetchEvents = async (): Promise<number | null> => {
     try {
       const response = await fetch("http://localhost:8000/api/live-pulse");
       if (!response.ok) {
@@ -36,22 +44,56 @@ export function LivePulse() {
       const data: LivePulseResponse = await response.json();
       setEvents(data.events);
       setError(null);
+      return data.cursor;
     } catch (err) {
       console.error("Error fetching live pulse:", err);
       setError("Unable to load live events");
+      return null;
     } finally {
       setLoading(false);
     }
   };
 
   useEffect(() => {
-    // Fetch immediately
-    fetchEvents();
+    const timer = setInterval(() => setNow(Date.now()), 60_000);
+    return () => clearInterval(timer);
+  }, []);
+
+  useEffect(() => {
+    let stream: EventSource | null = null;
+    let closed = false;
+
+    // Fetch immediately, then stream from that snapshot's cursor so changes published in
+    // between aren't lost; EventSource reconnects on its own and resumes from the last event ID it saw
+    fetchEvents().then((cursor) => {
+      if (closed) return;
+      const query = cursor !== null ? `?last_event_id=${cursor}` : "";
+      stream = new EventSource(`http://localhost:8000/api/live-pulse/stream${query}`);
+
+      // Event IDs are stable, so an update replaces the card in place
+      stream.addEventListener("player-event", (message) => {
+        const event: PlayerEvent = JSON.parse((message as MessageEvent).data);
+        setEvents((current) =>
+          current.some((e) => e.id === event.id)
+            ? current.map((e) => (e.id === event.id ? event : e))
+            : [event, ...current].slice(0, 8)
+        );
+      });
+
+      // e.g. a goal cancelled by VAR
+      stream.addEventListener("player-event-removed", (message) => {
+        const { id } = JSON.parse((message as MessageEvent).data);
+        setEvents((current) => current.filter((e) => e.id !== id));
+      });
 
-    // Refresh every 60 seconds
-    const interval = setInterval(fetchEvents, 60000);
+      // The server lost our position in the stream; reload the full list
+      stream.addEventListener("reset", () => fetchEvents());
+    });
 
-    return () => clearInterval(interval);
+    return () => {
+      closed = true;
+      stream?.close();
+    };
   }, []);
 
   if (loading) {
@@ -149,7 +191,9 @@ export function LivePulse() {
                     {event.league}
                   </Badge>
                   <span className="text-xs text-muted-foreground">
-                    {event.timestamp}
+                    {event.occurred_at != null
+                      ? timeAgo(event.occurred_at, now)
+                      : event.timestamp}
                   </span>
                 </div>
               </div>
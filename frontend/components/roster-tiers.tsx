@@ -188,34 +188,65 @@ function categorizePlayers(statsData: Record<string, PlayerSeasonStats>): Player
   return { locks, probables, bubble, cold }
 }
 
+// Season stats answer within a latency budget; players still loading come back as `missing`
+// and are retried with backoff until every player is in
+const RETRY_DELAYS_MS = [1000, 2000, 4000, 8000, 15000]
+
 export function RosterTiers() {
   const [players, setPlayers] = useState<PlayersByTier>(mockPlayers)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
+  const [pending, setPending] = useState<string[]>([])
 
   useEffect(() => {
-    async function loadStats() {
+    let cancelled = false
+    let retry: ReturnType<typeof setTimeout> | undefined
+
+    async function loadStats(attempt: number) {
       try {
-        setLoading(true)
         const data = await fetchSeasonStats()
-        
+        if (cancelled) return
+        const missing = data.missing ?? []
+
         if (data.players && Object.keys(data.players).length > 0) {
-          const categorized = categorizePlayers(data.players)
-          setPlayers(categorized)
-        } else {
+          setPlayers(categorizePlayers(data.players))
+          setLoading(false)
+        } else if (missing.length === 0) {
           // Use mock data if no real data available
           console.warn("No player data available, using mock data")
+          setLoading(false)
+        } else {
+          // Nothing ready yet but players still loading: keep the loading state, never mocks
+          setPlayers({ locks: [], probables: [], bubble: [], cold: [] })
+        }
+        setPending(missing)
+
+        if (missing.length > 0) {
+          if (attempt < RETRY_DELAYS_MS.length) {
+            retry = setTimeout(() => loadStats(attempt + 1), RETRY_DELAYS_MS[attempt])
+          } else {
+            setLoading(false)
+          }
         }
       } catch (err) {
+        if (cancelled) return
         console.error("Failed to load season stats:", err)
-        setError("Failed to load player stats. Using mock data.")
-        // Keep mock data on error
-      } finally {
+        if (attempt === 0) {
+          setError("Failed to load player stats. Using mock data.")
+          // Keep mock data on error
+        } else {
+          // A retry failed: keep whatever real stats arrived so far
+          setError("Failed to load the remaining player stats.")
+        }
         setLoading(false)
       }
     }
 
-    loadStats()
+    loadStats(0)
+    return () => {
+      cancelled = true
+      clearTimeout(retry)
+    }
   }, [])
 
   return (
@@ -228,6 +259,12 @@ export function RosterTiers() {
         </div>
       )}
 
+      {!loading && pending.length > 0 && (
+        <div className="rounded-lg bg-muted p-4 text-sm text-muted-foreground">
+          Still loading stats for {pending.length} player{pending.length === 1 ? "" : "s"}: {pending.join(", ")}
+        </div>
+      )}
+
       {error && (
         <div className="rounded-lg bg-yellow-500/10 border border-yellow-500/20 p-4 text-sm text-yellow-600 dark:text-yellow-400">
           {error}
@@ -19,6 +19,9 @@ export interface SeasonStatsResponse {
   season: string;
   players: Record<string, PlayerSeasonStats>;
   count: number;
+  // Players not loaded within the request budget, and players served past their TTL
+  missing?: string[];
+  stale?: string[];
   last_updated: string;
 }
 
@@ -28,7 +31,7 @@ export interface SeasonStatsResponse {
 export async function fetchSeasonStats(): Promise<SeasonStatsResponse> {
   try {
     const response = await fetch(`${API_BASE_URL}/api/season-stats`, {
-      cache: "no-store", // Always get fresh data
+      cache: "no-cache", // Always revalidate (ETag); unchanged data comes back as a 304
     });
 
     if (!response.ok) {
@@ -54,7 +57,7 @@ export async function fetchPlayerStats(
         playerName
       )}`,
       {
-        cache: "no-store",
+        cache: "no-cache",
       }
     );
 
@@ -70,7 +73,7 @@ export async function fetchPlayerStats(
 }
 
 export interface PlayerEvent {
-  id: number;
+  id: string;
   player: string;
   event: string;
   type: string;
@@ -79,11 +82,28 @@ export interface PlayerEvent {
   timestamp: string;
   league: string;
   team: string;
+  kickoff_at: number | null;
+  occurred_at: number | null;
 }
 
 export interface LivePulseResponse {
   events: PlayerEvent[];
   last_updated: string;
+  cursor: number;
+  next_before: string | null;
+  // Players whose events may be incomplete, and whether the snapshot missed its refresh
+  missing?: string[];
+  stale?: boolean;
+}
+
+export interface LivePulseDelta {
+  added: PlayerEvent[];
+  updated: PlayerEvent[];
+  removed: string[];
+  last_updated: string;
+  cursor: number;
+  missing?: string[];
+  stale?: boolean;
 }
 
 /**
@@ -92,7 +112,7 @@ export interface LivePulseResponse {
 export async function fetchLivePulse(): Promise<LivePulseResponse> {
   try {
     const response = await fetch(`${API_BASE_URL}/api/live-pulse`, {
-      cache: "no-store",
+      cache: "no-cache",
     });
 
     if (!response.ok) {
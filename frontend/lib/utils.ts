@@ -4,3 +4,18 @@ import { twMerge } from "tailwind-merge"
 export function cn(...inputs: ClassValue[]) {
   return twMerge(clsx(inputs))
 }
+
+/**
+ * Relative time ("3 hours ago") from epoch seconds; the API sends absolute times only
+ */
+export function timeAgo(epochSeconds: number, nowMs: number = Date.now()): string {
+  const seconds = Math.max(0, nowMs / 1000 - epochSeconds)
+  if (seconds < 60) return "just now"
+  const [value, unit] =
+    seconds < 3600
+      ? [Math.floor(seconds / 60), "minute"]
+      : seconds < 86400
+      ? [Math.floor(seconds / 3600), "hour"]
+      : [Math.floor(seconds / 86400), "day"]
+  return `${value} ${unit}${value !== 1 ? "s" : ""} ago`
+}